@@ -0,0 +1,56 @@
+""" Benchmark the cost of a log call, before and after the move to the logging module
+
+Usage: python benchmarks/log_overhead.py
+"""
+
+import contextlib
+import inspect
+import io
+import logging
+import time
+import timeit
+
+from eanalytics_api_py.internal import _log
+
+N_CALLS = 2000
+
+
+def inspect_log(log: str, print_log: bool = True) -> None:
+    """ The former Conn._log implementation """
+    if not isinstance(log, str):
+        raise TypeError("log should be str dtype")
+
+    if print_log:
+        stack = inspect.stack()
+        frame = stack[1]
+        caller_func = frame.function
+        caller_mod = inspect.getmodule(frame[0])
+        log_msg = f"{time.ctime()}:{caller_mod.__name__}:{caller_func}: {log}"
+        print(log_msg)
+
+
+def bench(label: str, stmt) -> None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        seconds = min(timeit.repeat(stmt, number=N_CALLS, repeat=3))
+    print(f"{label:<45} {1e6 * seconds / N_CALLS:10.2f} us/call")
+
+
+if __name__ == "__main__":
+    logger = logging.getLogger("eanalytics_api_py.benchmarks")
+    total, length = 123456, 987654
+
+    bench("before: inspect.stack(), print_log=True",
+          lambda: inspect_log("Write : " + str(total) + "/" + str(length)))
+    bench("before: print_log=False",
+          lambda: inspect_log("Write : " + str(total) + "/" + str(length), print_log=False))
+
+    # no Conn( print_log=True ) yet, INFO is below the level of the package logger
+    bench("after: logging, print_log=False",
+          lambda: logger.info("Write : %d/%d", total, length))
+
+    # the handler is created on sys.stdout at setup, swap its stream to mute it
+    _log._set_print_log(True)
+    _log._print_handler.setStream(io.StringIO())
+    bench("after: logging, print_log=True",
+          lambda: logger.info("Write : %d/%d", total, length))
+
@@ -0,0 +1,69 @@
+""" Benchmark the touchpoints reshaping, pd.wide_to_long versus eaload._reshape
+
+A synthetic order export with max-channel-level=40 and max-channel-info=14,
+most orders touching a few channel levels only
+
+Usage: python benchmarks/wide_to_long.py
+"""
+
+import re
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from eanalytics_api_py.eaload import _reshape
+
+N_ORDERS = 20000
+N_LEVELS = 40
+N_INFOS = 14
+EMPTY_VALUES = ['-', 0, None, '0', np.nan]
+
+
+def order_export() -> pd.DataFrame:
+    """ A datamining order export, channel columns renamed as in deduplicate_touchpoints """
+    rng = np.random.default_rng(0)
+    n_touched = rng.geometric(0.3, N_ORDERS)
+    d_col = {
+        "order_ref": [f"order{i}" for i in range(N_ORDERS)],
+        "order_amount": rng.random(N_ORDERS) * 100,
+        "a_channel_sz": n_touched,
+    }
+    for level in range(N_LEVELS):
+        touched = level < n_touched
+        for info in range(N_INFOS):
+            values = np.array([f"value{v}" for v in rng.integers(0, 50, N_ORDERS)], dtype=object)
+            values[~touched] = "-"
+            d_col[f"channel_lvl{level}_p{info}"] = values
+
+    df = pd.DataFrame(d_col)
+    df.columns = [re.sub(r'^(channel)_lvl(\d+)_(.+)$', r"\g<1>_\g<3>_\g<2>", col_name)
+                  for col_name in df.columns]
+    return df
+
+
+def pandas_reshape(df: pd.DataFrame, stubnames: list) -> pd.DataFrame:
+    """ The former deduplicate_touchpoints implementation """
+    df = pd.wide_to_long(df, stubnames=stubnames, i="order_ref", j="channel_position").reset_index()
+    return df[~df["channel_p0_"].isin(EMPTY_VALUES)]
+
+
+def engine_reshape(df: pd.DataFrame, stubnames: list) -> pd.DataFrame:
+    return _reshape._wide_to_long(
+        df, stubnames=stubnames, i="order_ref", j="channel_position",
+        drop_stub="channel_p0_", drop_values=EMPTY_VALUES)
+
+
+def bench(label: str, stmt) -> None:
+    seconds = min(timeit.repeat(stmt, number=1, repeat=3))
+    print(f"{label:<30} {seconds:10.3f} s")
+
+
+if __name__ == "__main__":
+    df = order_export()
+    stubnames = [f"channel_p{info}_" for info in range(N_INFOS)]
+
+    pd.testing.assert_frame_equal(pandas_reshape(df, stubnames), engine_reshape(df, stubnames))
+
+    bench("before: pd.wide_to_long", lambda: pandas_reshape(df, stubnames))
+    bench("after: eaload._reshape", lambda: engine_reshape(df, stubnames))
@@ -2,10 +2,7 @@
 retrieve data from Eulerian Technologies API
 """
 
-import inspect
-import time
-
-from eanalytics_api_py.internal import _request
+from eanalytics_api_py.internal import _request, _log
 
 
 class Conn:
@@ -24,6 +21,9 @@ class Conn:
 
     print_log: str, optional
         Set to False to hide log message
+        Messages go through the standard logging module, INFO messages
+            are printed on stdout, or go to the handlers configured by the application
+        Errors from the API are always logged
         Default: True
 
     host: str, optional
@@ -35,6 +35,10 @@ class Conn:
     authority: str, optional
         Force usage of dedicated authority platform
 
+    max_workers: int, optional
+        Maximum number of concurrent requests sent to the API
+        Default: 4
+
     Returns
     -------
         Class is instantiated
@@ -48,7 +52,8 @@ class Conn:
             print_log: bool = True,
             host: str = None,
             secure: bool = True,
-            authority: str = None
+            authority: str = None,
+            max_workers: int = 4
     ):
         if not isinstance(print_log, bool):
             raise TypeError("print_log should be a boolean type")
@@ -62,6 +67,9 @@ class Conn:
         if not isinstance(api_key, str) or len(api_key) == 0:
             raise TypeError("api_key should be a non-null string type")
 
+        if not isinstance(max_workers, int) or max_workers < 1:
+            raise TypeError("max_workers should be a positive integer")
+
         self._datacenter = datacenter
         self._gridpool_name = gridpool_name
         if host != None :
@@ -81,14 +89,23 @@ class Conn:
         self._api_key = api_key
         self._http_headers = {"Authorization": f"Bearer {api_key}"}
         self._print_log = print_log
+        self._max_workers = max_workers
+        # download_flat_realtime_report expanded paths, as { key : (expire, l_path) }
+        self._path_cache = {}
+        # download_realtime_report incremental results, as { key : pd.DataFrame }
+        self._realtime_cache = {}
+        _log._set_print_log(print_log)
         #self._check_credentials()
 
     # Import class methods
     from ._download_datamining import download_datamining
-    from ._download_edw import download_edw
+    from ._download_edw import download_edw, edw_cache_stats
+    from ._iter_edw import iter_edw
     from ._download_realtime_report import download_realtime_report
     from ._download_flat_realtime_report import download_flat_realtime_report, _get_all_paths, _all_paths_to_df
     from ._download_flat_overview_realtime_report import download_flat_overview_realtime_report
+    from ._download_many import download_datamining_many, download_edw_many, download_realtime_report_many, \
+        download_flat_realtime_report_many, download_flat_overview_realtime_report_many
 
     def _check_credentials(self) -> None:
         """Check credentials validity
@@ -120,60 +137,6 @@ class Conn:
         raise PermissionError(f"You're not allowed to access website_name={website_name}\n",
                               f"Allowed website_name: {', '.join(self._allowed_website_names)}")
 
-    def _log(
-            self,
-            log: str,
-    ) -> None:
-        """ A simple logging mechanism
-        Parameters
-        ----------
-        log: str, obligatory
-            Log message to be displayed
-
-        Returns
-        -------
-            None, print a log if print_log is True
-        """
-        if not isinstance(log, str):
-            raise TypeError("log should be str dtype")
-
-        if self._print_log:
-            stack = inspect.stack()
-            frame = stack[1]
-            caller_func = frame.function
-            caller_mod = inspect.getmodule(frame[0])
-            log_msg = f"{time.ctime()}:{caller_mod.__name__}:{caller_func}: {log}"
-            print(log_msg)
-
-        return None
-
-    def _logrewind(
-            self,
-            log: str,
-    ) -> None:
-        """ A simple logging mechanism
-        Parameters
-        ----------
-        log: str, obligatory
-            Log message to be displayed
-
-        Returns
-        -------
-            None, print a log if print_log is True
-        """
-        if not isinstance(log, str):
-            raise TypeError("log should be str dtype")
-
-        if self._print_log:
-            stack = inspect.stack()
-            frame = stack[1]
-            caller_func = frame.function
-            caller_mod = inspect.getmodule(frame[0])
-            log_msg = f"{time.ctime()}:{caller_mod.__name__}:{caller_func}: {log}"
-            print("\33[2K" + log_msg, end="\r")
-
-        return None
-
     def check_convert_realtime_filter(
             self,
             website_name: str,
@@ -10,11 +10,14 @@ import time
 from datetime import datetime, timedelta
 import csv
 import copy
+import logging
 
 import ijson
 
 from eanalytics_api_py.internal import _os, _request
 
+_LOGGER = logging.getLogger(__name__)
+
 
 def download_datamining(
         self,
@@ -172,7 +175,7 @@ def download_datamining(
                 status_waiting_seconds = 5
 
             while not ready:
-                self._log(f'Waiting for jobrun_id={jobrun_id} to complete')
+                _LOGGER.info('Waiting for jobrun_id=%s to complete', jobrun_id)
                 time.sleep(status_waiting_seconds)
                 status_json = _request._to_json(
                     request_type="get",
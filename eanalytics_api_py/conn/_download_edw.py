@@ -5,13 +5,20 @@ import re
 import time
 import urllib
 import gzip
+import zlib
 import csv
 import requests
 import ijson
 import sys
 import os
+import logging
+import concurrent.futures
+import hashlib
+import shutil
 
-from eanalytics_api_py.internal import _request, _log
+from eanalytics_api_py.internal import _request, _edw_reply, _cache, _progress
+
+_LOGGER = logging.getLogger( __name__ )
 
 #
 # @brief Get session token from Eulerian Authority services.
@@ -46,12 +53,33 @@ def gzip_compress( path_in, path_out ) :
         data = f.read()
         f.close()
     except IOError as e :
-        print( str( e ) )
+        _LOGGER.error( "%s", e )
         raise e
     with gzip.open( filename = path_out, mode = "wb" ) as gzipfile :
         gzipfile.write( data )
         gzipfile.close()
 #
+# @brief Check the CRC and the size recorded in each gzip member trailer.
+#
+# @param path - Compressed file path.
+# @param chunk_size - Size of the chunks read from the file.
+#
+def gzip_verify( path, chunk_size = 1048576 ) :
+    decompressor = zlib.decompressobj( 16 + zlib.MAX_WBITS )
+    with open( path, 'rb' ) as stream :
+        data = stream.read( chunk_size )
+        while data :
+            decompressor.decompress( data, chunk_size )
+            data = decompressor.unconsumed_tail
+            # Concatenated gzip members
+            if decompressor.eof and decompressor.unused_data :
+                data = decompressor.unused_data
+                decompressor = zlib.decompressobj( 16 + zlib.MAX_WBITS )
+            if not data :
+                data = stream.read( chunk_size )
+    if not decompressor.eof :
+        raise zlib.error( f"Truncated gzip file : {path}" )
+#
 # @brief Create a JOB on Eulerian Data Warehouse Platform.
 #
 # @param url - Url of Eulerian Data Warehouse Platform.
@@ -72,16 +100,82 @@ def job_create( url, headers, query, log ) :
         print_log = log
         )
 #
-# @brief Download JSON reply file of a JOB.
+# @brief Download a byte range of a JOB reply into an existing file, resume
+#        from the last byte written on transport errors.
 #
 # @param url - URL of Eulerian Data Warehouse Job reply.
+# @param headers - HTTP headers.
+# @param path - Output file path, the range is written at its offset.
+# @param begin - First byte of the range.
+# @param end - Last byte of the range, None up to the end of the reply.
+# @param chunk_size - Size of the chunks read from the socket.
+# @param retries - Number of resume attempts.
+# @param written - Called with the size of each written chunk.
+# @param reply - Already opened streamed reply starting at begin.
+# @param decode - Decode the transport layer encoding, else write raw bytes.
+#
+def fetch_range(
+    url, headers, path, begin, end, chunk_size, retries, written,
+    reply = None, decode = True
+    ) :
+    pos = begin
+    attempt = 0
+    with open( path, 'r+b' ) as stream :
+        stream.seek( pos )
+        while True :
+            try :
+                if reply is None :
+                    last = '' if end is None else str( end )
+                    reply = requests.get(
+                        url,
+                        headers = { **headers, 'Range' : f"bytes={pos}-{last}" },
+                        stream = True
+                        )
+                    if reply.status_code != 206 :
+                        raise IOError(
+                            f"Error[{reply.status_code}] requesting range {pos}-{last}"
+                            )
+                if decode :
+                    chunks = reply.iter_content( chunk_size )
+                else :
+                    chunks = reply.raw.stream( chunk_size, decode_content = False )
+                for chunk in chunks :
+                    stream.write( chunk )
+                    pos += len( chunk )
+                    written( len( chunk ) )
+                reply.close()
+                reply = None
+                if end is not None and pos <= end :
+                    raise IOError( f"Reply truncated at byte {pos}" )
+                return pos - begin
+            except ( requests.exceptions.RequestException, IOError ) as e :
+                if reply is not None :
+                    reply.close()
+                    reply = None
+                attempt += 1
+                if attempt > retries :
+                    raise e
+#
+# @brief Download reply file of a JOB.
+#
+# @param conn - Connection.
 # @param reply - Last reply.
 # @param headers - HTTP headers.
 # @param directory - Output directory.
+# @param chunk_size - Size of the chunks read from the socket.
+# @param n_connections - Number of concurrent ranged connections.
+# @param retries - Number of resume attempts of each connection.
+# @param passthrough - Store a gzip encoded reply as is, in a .gz file.
+# @param progress_callback - Called with the download progress.
+# @param progress_interval_ms - Minimum delay between two progress reports.
 #
-# @return JSON reply file path.
+# @return [ reply file path, reply format ]
 #
-def job_download( conn, reply, headers, directory ) :
+def job_download(
+    conn, reply, headers, directory,
+    chunk_size = 1048576, n_connections = 1, retries = 3, passthrough = False,
+    progress_callback = None, progress_interval_ms = 500
+    ) :
     uuid, url = reply[ 'data' ]
     reply = requests.get( url, headers = headers, stream = True )
     if reply.status_code != 200 :
@@ -97,20 +191,56 @@ def job_download( conn, reply, headers, directory ) :
         path = directory + '/' + str( uuid ) + '.' + prefix
     else :
         path = str( uuid ) + '.' + prefix
-    stream = open( path, 'wb' )
-    if stream is None :
-        return [ None, None ]
-    total = 0
-    length = reply.headers[ 'Content-Length' ]
-    for line in reply.iter_content( 8192 ) :
-        total += len( line )
-        conn._logrewind(
-            "Write : " + str( len( line ) ) + "/" + unit( total ) + 
-            "/" + unit( int( length ) )
+    length = reply.headers.get( 'Content-Length' )
+    length = int( length ) if length is not None else None
+    # Gzip encoded bytes are written as they come from the socket
+    passthrough = passthrough and \
+        reply.headers.get( 'Content-Encoding' ) == 'gzip'
+    if passthrough :
+        path += '.gz'
+    # Content-Length counts encoded bytes, the size of a decoded reply is unknown
+    elif reply.headers.get( 'Content-Encoding', 'identity' ) != 'identity' :
+        length = None
+    # Byte ranges are only meaningful on the decoded representation
+    rangeable = reply.headers.get( 'Accept-Ranges' ) == 'bytes' and \
+        reply.headers.get( 'Content-Encoding', 'identity' ) == 'identity'
+
+    # Preallocate the reply file
+    with open( path, 'wb' ) as stream :
+        if length :
+            stream.truncate( length )
+
+    progress = _progress._Progress(
+        length, conn._print_log, progress_callback, progress_interval_ms
+        )
+    written = progress.update
+
+    if rangeable and length and n_connections > 1 and \
+        length >= n_connections * chunk_size :
+        # Split the reply in n_connections contiguous ranges
+        reply.close()
+        step = -( -length // n_connections )
+        ranges = [
+            [ begin, min( begin + step, length ) - 1 ]
+            for begin in range( 0, length, step )
+            ]
+        with concurrent.futures.ThreadPoolExecutor( len( ranges ) ) as pool :
+            futures = [
+                pool.submit(
+                    fetch_range, url, headers, path, begin, end,
+                    chunk_size, retries, written
+                    )
+                for begin, end in ranges
+                ]
+            for future in futures :
+                future.result()
+    else :
+        fetch_range(
+            url, headers, path, 0, length - 1 if length else None,
+            chunk_size, retries if rangeable else 0, written, reply,
+            not passthrough
             )
-        stream.write( line )
-    conn._log( "" )
-    stream.close()
+    progress.close()
     return [ path, prefix ]
 # 
 # @brief Get JOB status.
@@ -150,19 +280,92 @@ def job_wait( reply, headers, log ) :
             status = reply[ 'status' ]
     return reply
 #
-# @brief Get human readable value.
+# @brief Submit a JOB on Eulerian Data Warehouse Platform and wait its end.
 #
-# @param value - Input value.
+# @param conn - Connection.
+# @param query - Eulerian Data Warehouse Command.
+# @param ip - Coma separated ip values.
+# @param accept - Expected reply output format.
+# @param encoding - Transport layer encoding.
 #
-# @return [ value, unit ]
+# @return [ Last reply, HTTP headers, JOB url ]
 #
-def unit( value ) :
-    iunit = 0
-    units = [ '', 'K', 'M', 'G', 'T', 'P' ]
-    while ( value / 1024.00 ) > 1.0 :
-        iunit += 1
-        value /= 1024
-    return "{:.2f}".format( value ) + units[ iunit ]
+def job_run( conn, query, ip, accept, encoding ) :
+    if not ip :
+        _LOGGER.info("No ip provided\
+            \n Fetching external ip from https://api.ipify.org\
+            \nif using a vpn, please provide the vpn ip\
+        ")
+        ip = requests.get( url = "https://api.ipify.org" ).text
+
+    # Get Eulerian session token
+    _LOGGER.info( "Requesting Authority services for a Session token" )
+    begin = time.time()
+    bearer = session(
+        conn._api_v2, conn._http_headers, ip, conn._print_log
+        )
+    end = time.time()
+    _LOGGER.info(
+        "Done requesting authority service : %.2f s", end - begin
+        )
+
+    # Create a Job
+    _LOGGER.info( "Submitting JOB" )
+    begin = time.time()
+    headers = {
+        "Authorization": "Bearer " + bearer,
+        "Content-Type": "application/json",
+        "Accept-Encoding" : encoding,
+        "Accept" : accept
+    }
+    reply = job_create( conn._edw_jobs, headers, query, conn._print_log )
+    end = time.time()
+    if reply is None :
+        _LOGGER.error( "Failed to Submit JOB" )
+        sys.exit( 2 )
+    status = reply[ 'status' ]
+    if status != 'Running' :
+        _LOGGER.error( "Failed to submit JOB." )
+        sys.exit( 2 )
+    uuid, url = reply[ 'data' ]
+    _LOGGER.info(
+        "Done submitting JOB. %.2f s", end - begin
+        )
+
+    # Wait end of Job
+    _LOGGER.info( "Waiting end of JOB : %s.", uuid )
+    begin = time.time()
+    reply = job_wait( reply, headers, conn._print_log )
+    if reply[ 'status' ] != 'Done' :
+        _LOGGER.error( "JOB failed.%s", reply )
+        sys.exit( 2 )
+    end = time.time()
+    _LOGGER.info( "JOB done. %.2f s", end - begin )
+    return [ reply, headers, url ]
+#
+# @brief Normalize an Eulerian Data Warehouse Command, whitespaces runs
+#        outside of quoted strings are collapsed.
+#
+# @param query - Eulerian Data Warehouse Command.
+#
+# @return Normalized command.
+#
+def normalize( query ) :
+    tokens = re.findall( r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|\s+|[^\s"\']+', query )
+    return ''.join(
+        ' ' if token.isspace() else token for token in tokens
+        ).strip()
+#
+# @brief Build the cache key of a reply file.
+#
+# @param args - Every parameter the reply file content depends on.
+#
+# @return Hexadecimal sha256 digest.
+#
+def cache_key( *args ) :
+    return hashlib.sha256(
+        '\n'.join( str( arg ) for arg in args ).encode( 'utf-8' )
+        ).hexdigest()
 #
 # @brief Add a JOB on Eulerian Data Warehouse plateform, wait end of the JOB,
 #        Download JSON reply, convert reply to CSV format then compress it.
@@ -180,6 +383,16 @@ def download_edw(
     override_file=False,
     compress=True,
     uuid=None,
+    convert=None,
+    row_group_size=100000,
+    chunk_size=1048576,
+    n_connections=4,
+    max_retries=3,
+    cache_directory=None,
+    cache_max_size=1073741824,
+    verify_gzip=False,
+    progress_callback=None,
+    progress_interval_ms=500,
 ) -> str:
     """ Fetch edw data from the API into a gzip compressed file
 
@@ -218,6 +431,52 @@ def download_edw(
     uuid : str, optional
         The job id to download directly from a previously requested jobrun
 
+    convert : str, optional
+        Convert a JSON reply into a columnar file ( parquet, arrow )
+        The reply is streamed, only one row group is held in memory
+        Requires pyarrow
+
+    row_group_size : int, optional
+        Number of rows of each row group of a converted reply
+        Default: 100000
+
+    chunk_size : int, optional
+        Size in bytes of the chunks read while downloading the reply
+        Default: 1048576
+
+    n_connections : int, optional
+        Number of concurrent HTTP Range connections used to download
+         the reply, when the server accepts byte ranges
+        Default: 4
+
+    max_retries : int, optional
+        Number of times an interrupted download resumes from the last
+         byte written
+        Default: 3
+
+    cache_directory : str, optional
+        Directory of a local result cache, keyed by the normalized query
+         and every argument the reply file depends on
+        override_file=True runs the job again and refreshes the cached reply
+        Default: None, no cache
+
+    cache_max_size : int, optional
+        Size in bytes over which least recently used cached replies are evicted
+        Default: 1073741824
+
+    verify_gzip : bool, optional
+        With encoding=gzip and compress=True the gzip encoded reply is
+         stored as is. Set to True to check its CRC once downloaded
+        Default: False
+
+    progress_callback : callable, optional
+        Called during the reply download with a dict as
+         { "done", "total", "percent", "rate", "eta" }
+
+    progress_interval_ms : int, optional
+        Minimum delay in milliseconds between two progress reports
+        Default: 500
+
     Returns
     -------
     str
@@ -248,6 +507,16 @@ def download_edw(
     # Get accept reply format 
     format = accept.split( '/' )[ 1 ]
 
+    if convert and convert not in _edw_reply._CONVERT_FORMATS :
+        raise ValueError(
+            f"convert={convert} not allowed. Allowed: {', '.join( _edw_reply._CONVERT_FORMATS )}"
+            )
+
+    # Identify the reply file content
+    key = cache_key(
+        self._gridpool_name, normalize( query ), accept, compress, convert
+        )
+
     if output_path2file :
         # Check that given reply file path prefix match accepted format
         prefix = output_path2file.split( '/' )[ -1 ].split( '.' )[ -1 ]
@@ -262,9 +531,13 @@ def download_edw(
             self._gridpool_name,
             "_".join( epochs_found[ 0 ] ),
             "_".join( readers ),
+            key[ : 10 ],
         ]) + '.' + format
 
     skippable = output_path2file
+    # A JSON reply is stored in the converted format
+    if convert and format == 'json' :
+        skippable = skippable[ : skippable.rfind( format ) ] + convert
     if compress :
         skippable += '.gz'
 
@@ -273,79 +546,71 @@ def download_edw(
         output_path2file = skippable,
         override_file = override_file,
         print_log = self._print_log ) :
-        return output_path2file
-
-    if not ip :
-        self._log("No ip provided\
-            \n Fetching external ip from https://api.ipify.org\
-            \nif using a vpn, please provide the vpn ip\
-        ")
-        ip = requests.get( url = "https://api.ipify.org" ).text
+        return skippable
 
-    # Get Eulerian session token
-    self._log( "Requesting Authority services for a Session token" )
-    begin = time.time()
-    bearer = session(
-        self._api_v2, self._http_headers, ip, self._print_log
-        )
-    end = time.time()
-    self._log(
-        "Done requesting authority service : {:.2f} s".format( end - begin )
-        )
+    # Serve the reply from the local cache, unless asked for a new one
+    cache = None
+    if cache_directory :
+        cache = _cache._FileCache( cache_directory, cache_max_size )
+        cached = None if override_file else cache.get( key )
+        if cached :
+            base = output_path2file[ : output_path2file.rfind( '.' + format ) ]
+            output_path2file = base + cached[ len( os.path.join( cache_directory, key ) ) : ]
+            _LOGGER.info( "Fetching data from cache file=%s", cached )
+            shutil.copyfile( cached, output_path2file )
+            return output_path2file
 
-    # Create a Job
-    self._log( "Submitting JOB" )
-    begin = time.time()
-    headers = {
-        "Authorization": "Bearer " + bearer,
-        "Content-Type": "application/json",
-        "Accept-Encoding" : encoding,
-        "Accept" : accept
-    }
-    reply = job_create( self._edw_jobs, headers, query, self._print_log )
-    end = time.time()
-    if reply is None :
-        self._log( "Failed to Submit JOB" )
-        sys.exit( 2 )
-    status = reply[ 'status' ]
-    if status != 'Running' :
-        self._log( "Failed to submit JOB." )
-        sys.exit( 2 )
-    uuid, url = reply[ 'data' ]
-    self._log(
-        "Done submitting JOB. {:.2f} s".format( end - begin )
+    # Run the Job and wait for its reply
+    reply, headers, url = job_run(
+        self, query, ip, accept, encoding
         )
 
-    # Wait end of Job
-    self._log( "Waiting end of JOB : " + str( uuid ) + "." )
-    begin = time.time()
-    reply = job_wait( reply, headers, self._print_log )
-    if reply[ 'status' ] != 'Done' :
-        self._log( "JOB failed." + str( reply ) )
-        sys.exit( 2 )
-    end = time.time()
-    self._log( "JOB done. {:.2f} s".format( end - begin ) )
-
     # Download Job reply
-    self._log( "Downloading JOB reply from the server" )
+    _LOGGER.info( "Downloading JOB reply from the server" )
     outdir = os.path.split( output_path2file )[ 0 ]
     begin = time.time()
-    path, prefix = job_download( self, reply, headers, outdir )
+    path, prefix = job_download(
+        self, reply, headers, outdir,
+        chunk_size, n_connections, max_retries,
+        compress and encoding == 'gzip',
+        progress_callback, progress_interval_ms
+        )
     if path is None :
-        self._log( "Failed to download JOB reply" )
+        _LOGGER.error( "Failed to download JOB reply" )
         sys.exit( 2 )
     end = time.time()
-    self._log( "JOB reply downloaded. {:.2f} s".format( end - begin ) )
+    _LOGGER.info( "JOB reply downloaded. %.2f s", end - begin )
+
+    # Reply stored as gzip encoded by the server
+    if path.endswith( '.gz' ) and verify_gzip :
+        _LOGGER.info( "Verifying gzip reply CRC" )
+        gzip_verify( path, chunk_size )
+
+    # Convert JSON reply into a columnar format if requested
+    if convert and prefix == 'json' :
+        _LOGGER.info( "Converting JSON reply to %s", convert )
+        begin = time.time()
+        converted = path[ : path.rfind( prefix ) ] + convert
+        _edw_reply._json_to_columnar(
+            path, converted, convert, row_group_size
+            )
+        os.remove( path )
+        path, prefix = converted, convert
+        end = time.time()
+        _LOGGER.info( "JSON reply converted. %.2f s", end - begin )
 
     # If gateway doesn't know the request reply format, rename output file
     # to reflect really downloaded format
     if format != prefix :
-        self._log( "Requested reply format can't be provided." )
         output_path2file = output_path2file[ : output_path2file.rfind( format ) ] + prefix
-        self._log( "JSON reply format is returned. " + output_path2file )
+        _LOGGER.info( "Requested reply format can't be provided." )
+        _LOGGER.info( "%s reply format is returned. %s", prefix.upper(), output_path2file )
 
     # Compress reply if requested
-    if compress :
+    if compress and path.endswith( '.gz' ) :
+        output_path2file += '.gz'
+        os.rename( path, output_path2file )
+    elif compress :
         output_path2file += '.gz'
         gzip_compress( path, output_path2file )
         os.remove( path )
@@ -356,6 +621,10 @@ def download_edw(
     # Kill the request on the server
     kill( url, headers )
 
+    if cache :
+        suffix = '.' + prefix + ( '.gz' if compress else '' )
+        cache.put( key, output_path2file, suffix )
+
     return output_path2file
 #
 # @brief Kill Eulerian Data Warehouse JOB.
@@ -368,3 +637,12 @@ def kill( url, headers ) :
     requests.get(
         url, headers = headers
         )
+#
+# @brief Get statistics of a local result cache of download_edw().
+#
+# @param cache_directory - Directory of the cache.
+#
+# @return { "hits", "misses", "entries", "size", "max_size" }
+#
+def edw_cache_stats( self, cache_directory, cache_max_size = 1073741824 ) :
+    return _cache._FileCache( cache_directory, cache_max_size ).stats()
@@ -4,7 +4,7 @@ from the Eulerian Technologies API"""
 import copy
 
 import pandas as pd
-from eanalytics_api_py.internal import _request
+from eanalytics_api_py.internal import _request, _pool, _dtype
 
 
 def download_flat_overview_realtime_report(
@@ -16,7 +16,9 @@ def download_flat_overview_realtime_report(
         kpi: list,
         channel: list = None,
         view_id: int = 0,
-        filters: dict = None
+        filters: dict = None,
+        group_channels: bool = False,
+        downcast: bool = False
 ) -> pd.DataFrame:
     """ Fetch realtime report data into a pandas dataframe
 
@@ -45,6 +47,16 @@ def download_flat_overview_realtime_report(
     filters: dict, optional
         To filter request results
 
+    group_channels: bool, optional
+        Set to True to request the channels sharing the same dimensions
+        and transformations in a single request, with comma-separated paths
+        Default: False
+
+    downcast: bool, optional
+        Set to True to convert kpis to the smallest integer dtype,
+        and to float32 when it holds every value exactly
+        Default: False, int64 and float64
+
     Returns
     -------
     pd.DataFrame()
@@ -66,6 +78,12 @@ def download_flat_overview_realtime_report(
     if not isinstance(kpi, list):
         raise TypeError("kpi should be a list dtype")
 
+    if not isinstance(group_channels, bool):
+        raise TypeError("group_channels should be a bool dtype")
+
+    if not isinstance(downcast, bool):
+        raise TypeError("downcast should be a bool dtype")
+
     payload = {
         'date-from': date_from,
         'date-to': date_to,
@@ -95,12 +113,14 @@ def download_flat_overview_realtime_report(
         name="eanalytics_api_py.internal.realtime_overview.path._" + report_name,
         fromlist=report_name)
 
-    l_df = []
     d_path = copy.deepcopy(path_module.d_path)  # because we override values we want a clean copy
 
     if not channel:
         channel = list(d_path.keys())
 
+    # channels processed alike share a request when group_channels is set
+    d_group_payload = {}
+    l_channel_payload = []
     for _channel in channel:
         l_path = d_path[_channel]["path"]
         l_path[0] = l_path[0] % int(d_website["website_id"])
@@ -109,55 +129,104 @@ def download_flat_overview_realtime_report(
         if not isinstance(l_dim, list):
             raise TypeError(f"l_dim={l_dim} should be a list dtype")
 
-        payload['path'] = ".".join(l_path)
-        payload['ea-columns'] = ",".join([*l_dim, *kpi])
-
-        _json = _request._to_json(
+        group_key = (
+            tuple(l_dim),
+            repr(d_path[_channel].get("rename_dim_map")),
+            repr(d_path[_channel].get("add_dim_value_map")))
+
+        if group_channels and group_key in d_group_payload:
+            d_group_payload[group_key]['path'] += "," + ".".join(l_path)
+            continue
+
+        channel_payload = dict(payload)
+        channel_payload['path'] = ".".join(l_path)
+        channel_payload['ea-columns'] = ",".join([*l_dim, *kpi])
+        d_group_payload[group_key] = channel_payload
+        l_channel_payload.append((d_path[_channel], channel_payload))
+
+    # each channel is transformed as soon as its response arrives
+    l_df = _pool._thread_map(
+        func=lambda channel_payload: _channel_to_df(
+            self,
             url=url,
-            request_type="get",
-            params=payload,
-            headers=self._http_headers,
-            print_log=True)
-
-        sub_df = pd.DataFrame(
-            data=_json["data"]["rows"],
-            columns=[d_field["name"] for d_field in _json["data"]["fields"]])
-
-        if "add_dim_value_map" in d_path[_channel]:
-            for _dim, _value in d_path[_channel]["add_dim_value_map"].items():
-                sub_df[_dim] = _value
-
-        if "rename_dim_map" in d_path[_channel]:
-            sub_df.rename(
-                columns=d_path[_channel]["rename_dim_map"],
-                inplace=True)
-
-        # override name with alias if alias is set
-        for name, alias in path_module.override_dim_map.items():
-            if all(_ in sub_df.columns for _ in [name, alias]):
-                mask = (sub_df[alias].isin([0, '0']))
-                sub_df.loc[mask, alias] = sub_df[name]
-                sub_df.drop(
-                    labels=alias,
-                    axis=1,
-                    inplace=True)
-
-        sub_df.rename(
-            columns=path_module.dim_px_map,
-            inplace=True)
-        l_df.append(sub_df)
+            payload=channel_payload[1],
+            d_channel=channel_payload[0],
+            path_module=path_module),
+        l_item=l_channel_payload,
+        max_workers=self._max_workers)
 
     df = pd.concat(
         l_df,
         axis=0,
         ignore_index=True)
 
-    for col_name in df.columns:
-        if col_name in path_module.dim_px_map.values():
-            df[col_name] = df[col_name].astype("category")
-        elif any(df[col_name].astype("str").str.contains(".", regex=False)):
-            df[col_name] = df[col_name].astype("float64")
-        else:
-            df[col_name] = df[col_name].astype("int64")
+    category_columns = list(path_module.dim_px_map.values())
+    _dtype._convert_dtypes(
+        df=df,
+        numeric_columns=[col_name for col_name in df.columns if col_name not in category_columns],
+        category_columns=category_columns,
+        downcast=downcast)
 
     return df
+
+
+def _channel_to_df(
+        self,
+        url: str,
+        payload: dict,
+        d_channel: dict,
+        path_module
+) -> pd.DataFrame:
+    """ Fetch a channel of the overview and map its dimensions to px columns
+
+    Parameters
+    ----------
+    url: str, obligatory
+        The realtime report url
+
+    payload: dict, obligatory
+        The channel payload, with path and ea-columns set
+
+    d_channel: dict, obligatory
+        The channel description from path_module.d_path
+
+    path_module: module, obligatory
+        The realtime overview path module
+
+    Returns
+    -------
+    pd.DataFrame()
+        A pandas dataframe
+    """
+    builder, _ = _request._to_columnar(
+        url=url,
+        params=payload,
+        headers=self._http_headers,
+        print_log=self._print_log)
+
+    sub_df = builder.to_df()
+
+    if "add_dim_value_map" in d_channel:
+        for _dim, _value in d_channel["add_dim_value_map"].items():
+            sub_df[_dim] = _value
+
+    if "rename_dim_map" in d_channel:
+        sub_df.rename(
+            columns=d_channel["rename_dim_map"],
+            inplace=True)
+
+    # override name with alias if alias is set
+    for name, alias in path_module.override_dim_map.items():
+        if all(_ in sub_df.columns for _ in [name, alias]):
+            mask = (sub_df[alias].isin([0, '0']))
+            sub_df.loc[mask, alias] = sub_df[name]
+            sub_df.drop(
+                labels=alias,
+                axis=1,
+                inplace=True)
+
+    sub_df.rename(
+        columns=path_module.dim_px_map,
+        inplace=True)
+
+    return sub_df
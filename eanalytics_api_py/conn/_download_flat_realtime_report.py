@@ -2,10 +2,15 @@
 from the Eulerian Technologies API"""
 
 from pprint import pprint
+import time
+import urllib
 
 import pandas as pd
 
-from eanalytics_api_py.internal import _request
+from eanalytics_api_py.internal import _request, _pool, _date
+
+# common server side limit of a request line
+_MAX_URL_LENGTH = 8000
 
 
 def download_flat_realtime_report(
@@ -18,7 +23,9 @@ def download_flat_realtime_report(
         kpi: list,
         date_scale: str = '',
         view_id: int = 0,
-        filters: dict = None
+        filters: dict = None,
+        path_cache_ttl: int = 0,
+        window_days: int = 0
 ) -> pd.DataFrame:
     """ Fetch realtime report data into a pandas dataframe
 
@@ -51,6 +58,19 @@ def download_flat_realtime_report(
     filters: dict, optional
         To filter request result
 
+    path_cache_ttl: int, optional
+        Seconds during which the expanded paths of a path template are reused
+        by later calls for the same website, report, dates, view and filters,
+        paths appearing in the meantime are missed until it expires
+        Default: 0, the paths are always expanded
+
+    window_days: int, optional
+        Requires date_scale
+        Split date_from/date_to into windows of at most window_days days,
+        aligned on the date_scale periods, fetched concurrently
+        Rows of each path batch are those of each window, the windows in chronological order
+        Default: 0, a single window
+
     Returns
     -------
     pd.DataFrame()
@@ -78,6 +98,15 @@ def download_flat_realtime_report(
     if not isinstance(date_scale, str):
         raise TypeError("date_scale be a str dtype")
 
+    if not isinstance(path_cache_ttl, int) or path_cache_ttl < 0:
+        raise TypeError("path_cache_ttl should be a positive integer")
+
+    if not isinstance(window_days, int) or window_days < 0:
+        raise TypeError("window_days should be a positive integer")
+
+    if window_days and not date_scale:
+        raise ValueError("window_days requires a date_scale, totals cannot be split")
+
     payload = {
         'date-from': date_from,
         'date-to': date_to,
@@ -101,6 +130,14 @@ def download_flat_realtime_report(
     if date_scale and date_scale not in l_allowed_scale:
         raise ValueError(f"date_scale={date_scale} not allowed. Allowed: {', '.join(l_allowed_scale)}")
 
+    l_window = [(date_from, date_to)]
+    if window_days:
+        l_window = _date._split_date_range(
+            date_from=date_from,
+            date_to=date_to,
+            date_scale=date_scale,
+            window_days=window_days)
+
     view_id = str(view_id)
     view_map = self.get_view_id_name_map(website_name)
     if view_id not in view_map:
@@ -119,14 +156,23 @@ def download_flat_realtime_report(
         if not isinstance(l_dim, list):
             raise ValueError("dim in path_dim_map should ba a list dtype")
 
-        l_path = path.split(".")
-        l_path[0] = l_path[0] % int(d_website["website_id"])
-        l_all_paths = self._get_all_paths(
-            i=1,
-            l_path=l_path,
-            l_prev_path=[l_path[0]],
-            url=url,
-            payload=payload)
+        # the expanded paths do not depend on the kpis
+        path_cache_key = (
+            website_name, report_name, path, date_from, date_to,
+            view_id, tuple(sorted(filters.items())))
+        expire, l_all_paths = self._path_cache.get(path_cache_key, (0, None))
+
+        if time.monotonic() >= expire:
+            l_path = path.split(".")
+            l_path[0] = l_path[0] % int(d_website["website_id"])
+            l_all_paths = self._get_all_paths(
+                i=1,
+                l_path=l_path,
+                l_prev_path=[l_path[0]],
+                url=url,
+                payload=payload)
+            if path_cache_ttl:
+                self._path_cache[path_cache_key] = (time.monotonic() + path_cache_ttl, l_all_paths)
 
         sub_df = self._all_paths_to_df(
             url=url,
@@ -134,7 +180,8 @@ def download_flat_realtime_report(
             l_dim=l_dim,
             l_kpi=kpi,
             payload=payload,
-            date_scale=date_scale)
+            date_scale=date_scale,
+            l_window=l_window)
 
         l_df.append(sub_df)
 
@@ -154,32 +201,62 @@ def _get_all_paths(
         url: str,
         payload: dict,
 ):
-    l_next_path = []
-    for prev_path in l_prev_path:
+    """ Expand a templated path breadth-first
+
+    Each [%d] level is expanded with one request per parent path,
+    sent concurrently through at most self._max_workers threads
+
+    Parameters
+    ----------
+    i: int, obligatory
+        Index of the first level of l_path to expand
+
+    l_path: list, obligatory
+        The path levels, templated levels end with [%d]
+
+    l_prev_path: list, obligatory
+        The already expanded parent paths
+
+    url: str, obligatory
+        The realtime report url
+
+    payload: dict, obligatory
+        The realtime report payload
+
+    Returns
+    -------
+    list
+        The expanded paths
+    """
+    for i in range(i, len(l_path)):
         if not l_path[i].endswith("[%d]"):
-            l_next_path.append(".".join([prev_path, l_path[i]]))
+            l_prev_path = [".".join([prev_path, l_path[i]]) for prev_path in l_prev_path]
+            continue
+
+        l_payload = []
+        for prev_path in l_prev_path:
+            level_payload = dict(payload)
+            level_payload["path"] = ".".join([prev_path, l_path[i].replace("[%d]", "")])
+            l_payload.append(level_payload)
 
-        else:
-            payload["path"] = ".".join([prev_path, l_path[i].replace("[%d]", "")])
-            _json = _request._to_json(
+        l_json = _pool._thread_map(
+            func=lambda level_payload: _request._to_json(
                 url=url,
                 request_type="get",
                 headers=self._http_headers,
-                params=payload,
+                params=level_payload,
                 print_log=self._print_log
-            )
-            for _id in _get_ids(_json):
-                l_next_path.append(".".join([prev_path, l_path[i] % int(_id)]))
+            ),
+            l_item=l_payload,
+            max_workers=self._max_workers)
 
-    if i == len(l_path) - 1:
-        return l_next_path
-    i += 1
-    return self._get_all_paths(
-        i=i,
-        l_path=l_path,
-        l_prev_path=l_next_path,
-        url=url,
-        payload=payload)
+        l_prev_path = [
+            ".".join([prev_path, l_path[i] % int(_id)])
+            for prev_path, _json in zip(l_prev_path, l_json)
+            for _id in _get_ids(_json)
+        ]
+
+    return l_prev_path
 
 
 def _all_paths_to_df(
@@ -189,40 +266,133 @@ def _all_paths_to_df(
         l_path: [],
         l_dim,
         l_kpi,
-        payload: {}
+        payload: {},
+        max_url_length: int = _MAX_URL_LENGTH,
+        l_window: list = None,
 ):
+    """ Fetch the data of every expanded path into a single DataFrame
+
+    Paths are sent comma-separated, in batches as large as max_url_length allows,
+    each batch for each date window, all fetched concurrently
+    through at most self._max_workers threads
+
+    Parameters
+    ----------
+    url: str, obligatory
+        The realtime report url
+
+    date_scale: str, obligatory
+        Split data for a given scale, '' for none
+
+    l_path: list, obligatory
+        The expanded paths
+
+    l_dim: list, obligatory
+        The dimensions to request
+
+    l_kpi: list, obligatory
+        The kpis to request
+
+    payload: dict, obligatory
+        The realtime report payload
+
+    max_url_length: int, optional
+        Maximum length of a request url
+
+    l_window: list, optional
+        The chronological (date-from, date-to) windows,
+        the rows of each batch are those of each window, in order
+        Default: the payload dates
+
+    Returns
+    -------
+    pd.DataFrame()
+        A pandas dataframe
+    """
     payload["ea-columns"] = "name," + ",".join([*l_dim, *l_kpi])
     if date_scale:
         del(payload["ea-columns"])
         payload["date-scale"] = date_scale
         payload["dd-dt"] = ",".join([*l_dim, *l_kpi])
 
-    l_slice_path = []
-    l_df = []
-    for i in range(len(l_path)):
-        l_slice_path.append(l_path[i])
-        if len(l_path) == 1 or (i and (i % 10 == 0 or i == len(l_path) - 1)):
-            payload['path'] = ",".join(l_slice_path)
-            _json = _request._to_json(
-                url=url,
-                request_type="get",
-                params=payload,
-                headers=self._http_headers,
-                print_log=self._print_log
-            )
-            sub_df = pd.DataFrame(
-                data=_json["data"]["rows"],
-                columns=[d_field["name"] for d_field in _json["data"]["fields"]])
+    l_window = l_window or [(payload["date-from"], payload["date-to"])]
 
-            l_df.append(sub_df)
-            l_slice_path = []
+    # each path batch for each chronological window
+    l_payload = []
+    for l_slice_path in _batch_paths(url, l_path, payload, max_url_length):
+        for date_from, date_to in l_window:
+            batch_payload = dict(payload)
+            batch_payload["path"] = ",".join(l_slice_path)
+            batch_payload["date-from"] = date_from
+            batch_payload["date-to"] = date_to
+            l_payload.append(batch_payload)
 
-    df_concat = pd.concat(
-        objs=l_df,
-        axis=0,
-        ignore_index=True)
+    if not l_payload:
+        return pd.DataFrame()
+
+    l_builder = _pool._thread_map(
+        func=lambda batch_payload: _request._to_columnar(
+            url=url,
+            params=batch_payload,
+            headers=self._http_headers,
+            print_log=self._print_log
+        )[0],
+        l_item=l_payload,
+        max_workers=self._max_workers)
+
+    # merge the column buffers, releasing each batch once merged,
+    # the DataFrame is built once
+    builder = l_builder.pop(0)
+    while l_builder:
+        builder.extend(l_builder.pop(0))
+
+    return builder.to_df()
+
+
+def _batch_paths(
+        url: str,
+        l_path: list,
+        payload: dict,
+        max_url_length: int
+):
+    """ Split paths into comma-separated batches fitting in max_url_length
+
+    Parameters
+    ----------
+    url: str, obligatory
+        The request url
+
+    l_path: list, obligatory
+        The paths to batch
+
+    payload: dict, obligatory
+        The request params, except path
+
+    max_url_length: int, obligatory
+        Maximum length of a request url
+
+    Returns
+    -------
+    generator
+        Lists of paths, each path is in exactly one list
+    """
+    params = {k: v for k, v in payload.items() if k != "path"}
+    # same encoding as _request._to_json, plus the "&path=" param
+    base_length = len(url) + 1 + len(urllib.parse.urlencode(params, safe='/')) + len("&path=")
+
+    l_slice_path = []
+    length = base_length
+    for path in l_path:
+        path_length = len(urllib.parse.quote(path, safe='/')) + len("%2C")
+        if l_slice_path and length + path_length > max_url_length:
+            yield l_slice_path
+            l_slice_path = []
+            length = base_length
+        l_slice_path.append(path)
+        length += path_length
 
-    return df_concat
+    if l_slice_path:
+        yield l_slice_path
 
 
 def _get_ids(_json):
@@ -0,0 +1,253 @@
+"""This module allows to run a download method
+for several websites concurrently"""
+
+import copy
+import logging
+
+import pandas as pd
+
+from eanalytics_api_py.internal import _pool
+from ._download_datamining import download_datamining
+from ._download_edw import download_edw
+from ._download_realtime_report import download_realtime_report
+from ._download_flat_realtime_report import download_flat_realtime_report
+from ._download_flat_overview_realtime_report import download_flat_overview_realtime_report
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _fan_out(
+        self,
+        method,
+        l_key: list,
+        d_kwargs: dict
+) -> list:
+    """ Call a download method once per key through the Conn thread pool
+
+    At most self._max_workers calls run at once, each call sends its requests
+    in series, the number of concurrent requests stays below self._max_workers
+
+    Parameters
+    ----------
+    method: callable, obligatory
+        The Conn method, called with the Conn and the kwargs of a key
+
+    l_key: list, obligatory
+        The keys, such as website names
+
+    d_kwargs: dict, obligatory
+        { key : kwargs of the call }, copied before each call
+
+    Returns
+    -------
+    list
+        [ { key : result }, { key : exception } ]
+    """
+    # per-call Conn sharing the caches, with serial requests
+    conn = copy.copy(self)
+    conn._max_workers = 1
+
+    def _call(key):
+        try:
+            return [method(conn, **copy.deepcopy(d_kwargs[key])), None]
+        # download_edw ends a failed job with sys.exit
+        except (Exception, SystemExit) as e:
+            _LOGGER.error("%s failed for %s: %r", method.__name__, key, e)
+            return [None, e]
+
+    l_result = _pool._thread_map(
+        func=_call,
+        l_item=l_key,
+        max_workers=self._max_workers)
+
+    d_result = {}
+    d_error = {}
+    for key, (result, error) in zip(l_key, l_result):
+        if error is None:
+            d_result[key] = result
+        else:
+            d_error[key] = error
+
+    return [d_result, d_error]
+
+
+def _check_website_names(website_names) -> list:
+    if not isinstance(website_names, list) or not website_names \
+            or not all(isinstance(website_name, str) for website_name in website_names):
+        raise TypeError("website_names should be a non-empty list of str")
+
+    if len(set(website_names)) != len(website_names):
+        raise ValueError("website_names should not hold duplicates")
+
+    return website_names
+
+
+def _concat_websites(d_df: dict) -> pd.DataFrame:
+    """ Concatenate the DataFrame of each website with a website_name column """
+    l_df = []
+    for website_name, df in d_df.items():
+        df.insert(0, "website_name", website_name)
+        l_df.append(df)
+
+    if not l_df:
+        return pd.DataFrame()
+
+    df = pd.concat(
+        objs=l_df,
+        axis=0,
+        ignore_index=True)
+    df["website_name"] = df["website_name"].astype("category")
+
+    return df
+
+
+def _df_many(
+        self,
+        method,
+        website_names: list,
+        kwargs: dict
+) -> list:
+    website_names = _check_website_names(website_names)
+    d_df, d_error = _fan_out(
+        self,
+        method=method,
+        l_key=website_names,
+        d_kwargs={website_name: {**kwargs, "website_name": website_name} for website_name in website_names})
+
+    return [_concat_websites(d_df), d_error]
+
+
+def download_realtime_report_many(
+        self,
+        website_names: list,
+        **kwargs
+) -> list:
+    """ Fetch a realtime report for several websites concurrently
+
+    Parameters
+    ----------
+    website_names: list, obligatory
+        Your targeted website_names in Eulerian Technologies platform
+
+    kwargs: optional
+        The arguments of download_realtime_report, but website_name
+
+    Returns
+    -------
+    list
+        [ pd.DataFrame() with a website_name column, { website_name : exception } ]
+        A failing website does not stop the others
+    """
+    return _df_many(self, download_realtime_report, website_names, kwargs)
+
+
+def download_flat_realtime_report_many(
+        self,
+        website_names: list,
+        **kwargs
+) -> list:
+    """ Fetch a flat realtime report for several websites concurrently
+
+    Parameters
+    ----------
+    website_names: list, obligatory
+        Your targeted website_names in Eulerian Technologies platform
+
+    kwargs: optional
+        The arguments of download_flat_realtime_report, but website_name
+
+    Returns
+    -------
+    list
+        [ pd.DataFrame() with a website_name column, { website_name : exception } ]
+        A failing website does not stop the others
+    """
+    return _df_many(self, download_flat_realtime_report, website_names, kwargs)
+
+
+def download_flat_overview_realtime_report_many(
+        self,
+        website_names: list,
+        **kwargs
+) -> list:
+    """ Fetch a flat overview realtime report for several websites concurrently
+
+    Parameters
+    ----------
+    website_names: list, obligatory
+        Your targeted website_names in Eulerian Technologies platform
+
+    kwargs: optional
+        The arguments of download_flat_overview_realtime_report, but website_name
+
+    Returns
+    -------
+    list
+        [ pd.DataFrame() with a website_name column, { website_name : exception } ]
+        A failing website does not stop the others
+    """
+    return _df_many(self, download_flat_overview_realtime_report, website_names, kwargs)
+
+
+def download_datamining_many(
+        self,
+        website_names: list,
+        **kwargs
+) -> list:
+    """ Fetch a datamining for several websites concurrently
+
+    Parameters
+    ----------
+    website_names: list, obligatory
+        Your targeted website_names in Eulerian Technologies platform
+
+    kwargs: optional
+        The arguments of download_datamining, but website_name
+
+    Returns
+    -------
+    list
+        [ { website_name : list of path2file }, { website_name : exception } ]
+        A failing website does not stop the others
+    """
+    website_names = _check_website_names(website_names)
+    return _fan_out(
+        self,
+        method=download_datamining,
+        l_key=website_names,
+        d_kwargs={website_name: {**kwargs, "website_name": website_name} for website_name in website_names})
+
+
+def download_edw_many(
+        self,
+        queries: dict,
+        **kwargs
+) -> list:
+    """ Fetch several edw queries concurrently
+
+    Parameters
+    ----------
+    queries: dict, obligatory
+        { name : EDW query }, such as one query per website_name
+
+    kwargs: optional
+        The arguments of download_edw, but query
+        n_connections defaults to 1, the queries already run concurrently
+
+    Returns
+    -------
+    list
+        [ { name : output_path2file }, { name : exception } ]
+        A failing query does not stop the others
+    """
+    if not isinstance(queries, dict) or not queries:
+        raise TypeError("queries should be a non-empty dict")
+
+    if "output_path2file" in kwargs:
+        raise ValueError("output_path2file would be shared by the queries, use the default names")
+
+    return _fan_out(
+        self,
+        method=download_edw,
+        l_key=list(queries),
+        d_kwargs={name: {"n_connections": 1, **kwargs, "query": query} for name, query in queries.items()})
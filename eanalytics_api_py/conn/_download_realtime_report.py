@@ -1,9 +1,17 @@
 """This module allows to download realtime report data
 from the Eulerian Technologies API"""
 
+import datetime
+import logging
+
 import pandas as pd
 
-from eanalytics_api_py.internal import _request
+from eanalytics_api_py.internal import _request, _dtype, _date, _pool
+
+_LOGGER = logging.getLogger(__name__)
+
+# incremental results kept per Conn, the least recently used are dropped
+_REALTIME_CACHE_SIZE = 16
 
 
 def download_realtime_report(
@@ -11,6 +19,10 @@ def download_realtime_report(
         website_name: str,
         report_name: list,
         payload: dict,
+        incremental: bool = False,
+        date_column: str = "date",
+        window_days: int = 0,
+        downcast: bool = False,
 ):
     """ Fetch realtime report data into a pandas dataframe
 
@@ -24,6 +36,33 @@ def download_realtime_report(
     payload : dict, mandatory
         The realtime report payload
 
+    incremental: bool, optional
+        Requires 'date-scale' : 'H' in payload
+        Set to True to keep the result of each (website_name, report_name, payload),
+        the next call only fetches the data from the last hour of the previous result,
+        which is replaced, and returns the merged result
+        The rows before the last hour are reused, the rows from the last hour are
+        replaced by the fetched ones. The date-from of the API is a day: the day of
+        the last hour and the day before, for the website timezone, are requested
+        again, never before the payload date-from. At most 16 results are kept per Conn
+        Default: False
+
+    date_column: str, optional
+        The column holding the epoch timestamp of each row
+        Default: 'date'
+
+    window_days: int, optional
+        Requires a 'date-scale' in payload
+        Split date-from/date-to into windows of at most window_days days,
+        aligned on the date-scale periods, fetched concurrently
+        Rows are those of each window, the windows in chronological order
+        Default: 0, a single request
+
+    downcast: bool, optional
+        Set to True to convert kpis to the smallest integer dtype,
+        and to float32 when it holds every value exactly
+        Default: False, int64 and float64
+
     Returns
     -------
     pd.DataFrame()
@@ -42,30 +81,183 @@ def download_realtime_report(
     if not payload:
         raise ValueError("payload should not be empty")
 
+    if not isinstance(incremental, bool):
+        raise TypeError("incremental should be a bool type")
+
+    if not isinstance(date_column, str):
+        raise TypeError("date_column should be a str type")
+
+    if not isinstance(window_days, int) or window_days < 0:
+        raise TypeError("window_days should be a positive integer")
+
+    if window_days and not payload.get("date-scale"):
+        raise ValueError("window_days requires a 'date-scale' in payload, totals cannot be split")
+
+    if not isinstance(downcast, bool):
+        raise TypeError("downcast should be a bool type")
+
+    if incremental and payload.get("date-scale") != "H":
+        raise ValueError("incremental requires 'date-scale' : 'H' in payload")
+
     report_url = f"{self._api_v2}/ea/{website_name}/report/realtime/{report_name}.json"
     payload['ea-switch-datetorow'] = 1  # include the date in each row
     payload['ea-enable-datefmt'] = "%s"  # format the date as an epoch timestamp
 
-    report_json = _request._to_json(
-        request_type="get",
-        url=report_url,
-        params=payload,
-        headers=self._http_headers,
-        print_log=self._print_log
-    )
-
-    fields = [field['name'] for field in report_json['data']['fields']]
-    rows = report_json['data']['rows']
-
-    df = pd.DataFrame(
-        columns=fields,
-        data=rows,
-    )
-    for col_name in df.columns:
-        if col_name != "name":
-            if any(df[col_name].astype("str").str.contains(".", regex=False)):
-                df[col_name] = df[col_name].astype("float64")
-            else:
-                df[col_name] = df[col_name].astype("int64")
+    if not incremental:
+        return _fetch(self, report_url, payload, window_days, downcast)
+
+    cache_key = (website_name, report_name, tuple(sorted((k, str(v)) for k, v in payload.items())))
+    df_prev = self._realtime_cache.pop(cache_key, None)
+    if df_prev is None:
+        df = _fetch(self, report_url, payload, window_days, downcast)
+        if date_column not in df.columns:
+            raise ValueError(f"date_column={date_column} not found in the report columns")
+        _keep_result(self, cache_key, df, date_column)
+        return df
+
+    # the last hour of the previous result may be incomplete
+    open_hour = int(df_prev[date_column].max())
+    date_from = _refresh_date_from(open_hour, payload["date-from"])
+
+    _LOGGER.info("Refreshing report_name=%s from date-from=%s", report_name, date_from)
+    df_new = _fetch(
+        self,
+        report_url=report_url,
+        payload={**payload, "date-from": date_from},
+        window_days=window_days,
+        downcast=downcast)
+
+    df = pd.concat(
+        objs=[
+            df_prev[df_prev[date_column] < open_hour],
+            df_new[df_new[date_column] >= open_hour]
+        ],
+        axis=0,
+        ignore_index=True)
+    # categories of both frames may differ
+    _dtype._convert_dtypes(
+        df=df,
+        numeric_columns=[col_name for col_name in df.columns if col_name != "name"],
+        category_columns=["name"],
+        downcast=downcast)
+
+    _keep_result(self, cache_key, df, date_column)
+    return df
+
+
+def _refresh_date_from(
+        open_hour: int,
+        date_from: str
+) -> str:
+    """ Return the first day to fetch again for a result whose last hour is open_hour
+
+    The day of open_hour depends on the website timezone, unknown here,
+    the day before its UTC day is fetched again as well, never before date_from
+
+    Parameters
+    ----------
+    open_hour: int, obligatory
+        The epoch timestamp of the last hour of the result
+
+    date_from: str, obligatory
+        mm/dd/yyyy, the date-from of the payload
+
+    Returns
+    -------
+    str
+        mm/dd/yyyy
+    """
+    day = datetime.datetime.fromtimestamp(open_hour, tz=datetime.timezone.utc).date()
+    day -= datetime.timedelta(days=1)
+    if day <= datetime.datetime.strptime(date_from, _date._DATE_FORMAT).date():
+        return date_from
+
+    return day.strftime(_date._DATE_FORMAT)
+
+
+def _keep_result(
+        self,
+        cache_key: tuple,
+        df: pd.DataFrame,
+        date_column: str
+) -> None:
+    """ Keep a copy of an incremental result, its rows before the last hour are reused
+
+    The least recently used results beyond _REALTIME_CACHE_SIZE are dropped
+    """
+    if not len(df) or df[date_column].isna().all():
+        return None
+
+    # the caller may modify the returned DataFrame
+    self._realtime_cache[cache_key] = df.copy()
+    while len(self._realtime_cache) > _REALTIME_CACHE_SIZE:
+        del self._realtime_cache[next(iter(self._realtime_cache))]
+
+    return None
+
+
+def _fetch(
+        self,
+        report_url: str,
+        payload: dict,
+        window_days: int = 0,
+        downcast: bool = False
+) -> pd.DataFrame:
+    """ Fetch a realtime report into a pandas dataframe with converted dtypes
+
+    Parameters
+    ----------
+    report_url: str, obligatory
+        The realtime report url
+
+    payload: dict, obligatory
+        The realtime report payload
+
+    window_days: int, optional
+        Maximum number of days of a request, 0 for a single request
+
+    downcast: bool, optional
+        Convert kpis to the smallest dtype
+
+    Returns
+    -------
+    pd.DataFrame()
+        A pandas dataframe
+    """
+    l_payload = [payload]
+    if window_days:
+        l_payload = [
+            {**payload, "date-from": date_from, "date-to": date_to}
+            for date_from, date_to in _date._split_date_range(
+                date_from=payload["date-from"],
+                date_to=payload["date-to"],
+                date_scale=payload["date-scale"],
+                window_days=window_days)
+        ]
+
+    l_result = _pool._thread_map(
+        func=lambda window_payload: _request._to_columnar(
+            url=report_url,
+            params=window_payload,
+            headers=self._http_headers,
+            print_log=self._print_log
+        ),
+        l_item=l_payload,
+        max_workers=self._max_workers)
+
+    # windows are chronological, merge the column buffers in order
+    builder, fields = l_result.pop(0)
+    while l_result:
+        builder.extend(l_result.pop(0)[0])
+
+    df = builder.to_df()
+
+    # every column but name is a kpi, or the date
+    _dtype._convert_dtypes(
+        df=df,
+        numeric_columns=[col_name for col_name in df.columns if col_name != "name"],
+        fields=fields,
+        category_columns=["name"],
+        downcast=downcast)
 
     return df
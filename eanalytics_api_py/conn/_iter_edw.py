@@ -0,0 +1,108 @@
+"""This module allows to stream the raw data
+from the Eulerian Data Warehouse without any intermediate file"""
+
+import logging
+
+import requests
+
+from eanalytics_api_py.internal import _edw_reply
+from ._download_edw import job_run, kill
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def iter_edw(
+        self,
+        query: str,
+        batch_size: int = 10000,
+        ip: str = None,
+        accept: str = "application/json",
+        encoding: str = "identity",
+        arrow: bool = False,
+        sep: str = ';',
+):
+    """ Stream edw data from the API by batches of rows
+
+    The reply is decoded on the fly, nothing is written on disk
+    and at most one batch of rows is held in memory
+
+    Parameters
+    ----------
+    query: str, obligatory
+        EDW query
+
+    batch_size: int, optional
+        Maximum number of rows in each yielded batch
+        Default: 10000
+
+    ip: str, optional
+        Coma separated ip values
+        Default: Automatically fetch your external ip address
+
+    accept : str, optional
+        Specify expected reply output format ( application/json,
+         application/parquet, text/csv )
+
+    encoding : str, optional
+        Specify transport layer encoding ( identity, gzip )
+
+    arrow: bool, optional
+        Set to True to yield pyarrow.RecordBatch instead of lists of tuples
+        Requires pyarrow
+        Default: False
+
+    sep: str, optional
+        The csv sep char of a text/csv reply
+        Default: ';'
+
+    Returns
+    -------
+    generator
+        Batches of rows, as lists of tuples or pyarrow.RecordBatch
+    """
+    if not isinstance(query, str) or not query:
+        raise TypeError("query should be a non-empty str type")
+
+    if not isinstance(batch_size, int) or batch_size < 1:
+        raise TypeError("batch_size should be a positive integer")
+
+    if not isinstance(arrow, bool):
+        raise TypeError("arrow should be a bool type")
+
+    reply, headers, url = job_run(self, query, ip, accept, encoding)
+    uuid, download_url = reply['data']
+
+    _LOGGER.info("Streaming JOB reply : %s", uuid)
+    try:
+        with requests.get(download_url, headers=headers, stream=True) as r:
+            if r.status_code != 200:
+                raise SystemError(f"Error[{r.status_code}] downloading JOB reply={uuid}")
+
+            # let urllib3 handle the transport layer encoding
+            r.raw.decode_content = True
+            content_type = r.headers['Content-Type']
+
+            # same content types as job_download
+            if content_type == 'application/json':
+                batches = _edw_reply._iter_batches(
+                    events=_edw_reply._iter_json_reply(r.raw),
+                    batch_size=batch_size,
+                    arrow=arrow)
+            elif content_type == 'text/csv':
+                batches = _edw_reply._iter_batches(
+                    events=_edw_reply._iter_csv_reply(r.raw, sep=sep),
+                    batch_size=batch_size,
+                    arrow=arrow)
+            elif content_type == 'text/plain':
+                batches = _edw_reply._iter_parquet_batches(
+                    stream=r.raw,
+                    batch_size=batch_size,
+                    arrow=arrow)
+            else:
+                raise ValueError(f"Unexpected reply Content-Type={content_type}")
+
+            for batch in batches:
+                yield batch
+    finally:
+        # Kill the request on the server
+        kill(url, headers)
@@ -2,3 +2,4 @@
 
 from . import datamining
 from . import generic
+from . import schema
@@ -0,0 +1,177 @@
+""" Wide to long reshaping of datamining level columns
+
+Same output as pd.wide_to_long(...).reset_index() followed by a filter
+on the values of a stub, rows to drop are never materialized
+Sparse level columns ( eaload sparse=True ) are read through their non fill cells
+"""
+
+import re as _re
+
+import numpy as np
+import pandas as _pd
+
+
+def _wide_to_long(
+    df : _pd.DataFrame,
+    stubnames : list,
+    i : str,
+    j : str,
+    drop_stub : str,
+    drop_values : list
+):
+    """ Stack the stub columns of a dataframe and drop the empty levels
+
+    Equivalent to:
+        df = pd.wide_to_long(df, stubnames, i=i, j=j).reset_index()
+        df = df[~df[drop_stub].isin(drop_values)]
+
+    Parameters
+    ----------
+    df : pd.DataFrame, obligatory
+        The wide dataframe, stub columns named <stubname><int>
+
+    stubnames : list, obligatory
+        The stub names
+
+    i : str, obligatory
+        The column identifying each row
+
+    j : str, obligatory
+        The name of the suffix column
+
+    drop_stub : str, obligatory
+        The stub whose values tell if a level is empty
+
+    drop_values : list, obligatory
+        The values of an empty level
+
+    Returns
+    -------
+    pd.Dataframe
+        Pandas dataframe object, None if the layout requires pd.wide_to_long
+    """
+    columns = list(df.columns)
+    if len(set(columns)) != len(columns) or j in columns or i not in columns \
+            or any(stubname in columns for stubname in stubnames) \
+            or drop_stub not in stubnames or df[i].duplicated().any():
+        return None
+
+    # value columns of each stub, in the columns order, and their suffix
+    l_value_vars = []
+    suffixes = None
+    for stubname in stubnames:
+        regex = _re.compile(rf"^{_re.escape(stubname)}\d+$")
+        value_vars = [col_name for col_name in columns if regex.match(col_name)]
+        stub_suffixes = [int(col_name[len(stubname):]) for col_name in value_vars]
+        if suffixes is None:
+            suffixes = stub_suffixes
+        # the levels of every stub should be aligned
+        if not value_vars or stub_suffixes != suffixes:
+            return None
+        l_value_vars.append(value_vars)
+
+    if len(set(suffixes)) != len(suffixes):
+        return None
+
+    n_rows = len(df)
+    n_levels = len(suffixes)
+
+    # ( n_levels, n_rows ) mask of the kept levels, level major as pd.melt
+    drop_value_vars = l_value_vars[stubnames.index(drop_stub)]
+    keep = np.empty((n_levels, n_rows), dtype=bool)
+    for level, col_name in enumerate(drop_value_vars):
+        keep[level] = ~_isin(df[col_name], drop_values)
+
+    l_level, l_row = np.nonzero(keep)
+    index = _pd.RangeIndex(n_levels * n_rows)[keep.ravel()]
+
+    value_vars_flattened = [col_name for value_vars in l_value_vars for col_name in value_vars]
+    id_vars = df.columns.difference(value_vars_flattened)
+
+    d_col = {
+        i: _take(df[i], l_row),
+        j: _pd.Series(np.asarray(suffixes, dtype=np.int64)[l_level]),
+    }
+    for col_name in id_vars:
+        if col_name != i:
+            d_col[col_name] = _take(df[col_name], l_row, dense=False)
+
+    # the kept rows of each level, concatenated with the pd.melt dtype rules
+    l_level_rows = np.split(l_row, np.cumsum(np.bincount(l_level, minlength=n_levels))[:-1])
+    for stubname, value_vars in zip(stubnames, l_value_vars):
+        d_col[stubname] = _pd.concat(
+            [_take(df[col_name], rows) for col_name, rows in zip(value_vars, l_level_rows)],
+            ignore_index=True
+        )
+
+    for col in d_col.values():
+        col.index = index
+
+    return _pd.DataFrame(d_col, index=index)
+
+
+def _isin(
+    col : _pd.Series,
+    values : list
+):
+    """ Return the mask of the cells of col in values, a sparse col is read through its non fill cells """
+    if not isinstance(col.dtype, _pd.SparseDtype):
+        return col.isin(values).to_numpy()
+
+    sparse = col.array
+    mask = np.full(len(col), _pd.Series([sparse.fill_value], dtype=object).isin(values).iloc[0])
+    mask[sparse.sp_index.indices] = _pd.Series(sparse.sp_values).isin(values).to_numpy()
+
+    return mask
+
+
+def _take(
+    col : _pd.Series,
+    rows : np.ndarray,
+    dense=True
+):
+    """ Return the cells of col at rows, a sparse col is read through its non fill cells
+
+    Parameters
+    ----------
+    col : pd.Series, obligatory
+        The column
+
+    rows : np.ndarray, obligatory
+        The positions of the cells
+
+    dense : bool, optional
+        Set to False to keep a sparse col sparse
+        Default: True
+
+    Returns
+    -------
+    pd.Series
+        The cells, with a RangeIndex
+    """
+    if not isinstance(col.dtype, _pd.SparseDtype):
+        return col.take(rows).reset_index(drop=True)
+
+    sparse = col.array
+    indices = sparse.sp_index.indices
+
+    # position of each row among the non fill cells
+    positions = np.searchsorted(indices, rows)
+    found = positions < len(indices)
+    found[found] = indices[positions[found]] == rows[found]
+    sp_values = sparse.sp_values[positions[found]]
+
+    if not dense:
+        # the non fill cells are known, no comparison to the fill value
+        sp_index = _pd.arrays.SparseArray(found, fill_value=False).sp_index
+        return _pd.Series(_pd.arrays.SparseArray(
+            sp_values,
+            sparse_index=sp_index,
+            fill_value=sparse.fill_value,
+            dtype=col.dtype
+        ))
+
+    values = np.full(len(rows), sparse.fill_value, dtype=sparse.sp_values.dtype)
+    values[found] = sp_values
+
+    return _pd.Series(values)
@@ -7,6 +7,9 @@ import re as _re
 import pandas as _pd
 import numpy as np
 from .generic import csv_files_2_df
+from . import _reshape
+
+_EMPTY_VALUES = ['-', 0, None, '0', np.nan]
 
 
 def deduplicate_touchpoints(
@@ -19,6 +22,9 @@ def deduplicate_touchpoints(
 ):
     """ Deduplicate marketing touchpoints
 
+        Sparse columns, see csv_files_2_df( sparse=True ), are reshaped
+        without being densified, the channel columns of the result are dense
+
         Parameters
         ----------
         source : list of path2file OR pandas DataFrame
@@ -89,13 +95,26 @@ def deduplicate_touchpoints(
 
     df.columns = columns
 
-    df = _pd.wide_to_long(
+    df_long = _reshape._wide_to_long(
         df,
         stubnames=stubnames,
         i="order_ref",
         j="channel_position",
-    ).reset_index()
-
+        drop_stub="channel_p0_",
+        drop_values=_EMPTY_VALUES,
+    )
+
+    # unusual layouts, such as levels missing for some channel columns
+    if df_long is None:
+        df_long = _pd.wide_to_long(
+            df,
+            stubnames=stubnames,
+            i="order_ref",
+            j="channel_position",
+        ).reset_index()
+        df_long = df_long[~df_long["channel_p0_"].isin(_EMPTY_VALUES)]
+
+    df = df_long
     columns = []
     for col_name in df.columns:
         if col_name.startswith('channel_') and col_name.endswith('_'):
@@ -103,7 +122,6 @@ def deduplicate_touchpoints(
         columns.append(col_name)
 
     df.columns = columns
-    df = df[~df.channel_p0.isin(['-', 0, None, '0', np.nan])]
 
     return df
 
@@ -127,6 +145,8 @@ def deduplicate_products(
 
     This duplicates row for every product and normalize the product param columns.
     Rows having an empty product ref will be discarded.
+    Sparse columns, see csv_files_2_df( sparse=True ), are reshaped
+    without being densified, the product columns of the result are dense
 
     Parameters
     ----------
@@ -212,12 +232,24 @@ def deduplicate_products(
         if stubname in columns:
             raise ValueError(f"stubname={stubname} should not equal to a column name")
 
-    df = _pd.wide_to_long(
-        df=df,
+    df_long = _reshape._wide_to_long(
+        df,
         stubnames=stubnames,
         i="order_ref",
-        j="product_position"
-    ).reset_index()
-    df = df[~df.orderproduct_ref.isin(['-', 0, None, '0', np.nan])]
+        j="product_position",
+        drop_stub="orderproduct_ref",
+        drop_values=_EMPTY_VALUES,
+    )
+
+    if df_long is None:
+        df_long = _pd.wide_to_long(
+            df=df,
+            stubnames=stubnames,
+            i="order_ref",
+            j="product_position"
+        ).reset_index()
+        df_long = df_long[~df_long.orderproduct_ref.isin(_EMPTY_VALUES)]
+
+    df = df_long
 
     return df
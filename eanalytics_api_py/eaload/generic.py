@@ -1,7 +1,18 @@
 """ Generic load from csv file into pandas DataFrame with transformation """
 
+import datetime as _datetime
+import hashlib as _hashlib
+import json as _json
+import logging as _logging
+import os as _os
 import re as _re
 import pandas as _pd
+from pandas.api.types import union_categoricals as _union_categoricals
+
+from ..internal import _pool, _cache, _optional
+from . import schema as _schema
+
+_LOGGER = _logging.getLogger(__name__)
 
 def csv_files_2_df(
     path2files : list,
@@ -9,6 +20,11 @@ def csv_files_2_df(
     quotechar='"',
     compression='gzip',
     encoding='utf-8',
+    n_jobs=1,
+    schema_directory=None,
+    cache_directory=None,
+    cache_max_size=10737418240,
+    sparse=False,
     **kwargs
 ):
     """ Load a list of csv files into a pandas dataframe
@@ -34,6 +50,35 @@ def csv_files_2_df(
         The file encoding
         Default: 'utf-8'
 
+    n_jobs: int, optional
+        Number of processes reading the files, -1 for one per cpu
+        Default: 1
+
+    schema_directory : str, optional
+        The directory of the schemas of each file family ( eaload.schema )
+        The dtypes are passed to pd.read_csv, categorical columns
+        are parsed as categories of str without intermediate objects
+        Combine with usecols to load a subset of the columns
+        Default: None, dtypes are inferred then converted
+
+    cache_directory : str, optional
+        Directory of a Feather sidecar cache ( requires pyarrow )
+        Each loaded file is stored once parsed, keyed by its path, mtime, size
+        and the read arguments, later loads memory-map the sidecar
+        Default: None, no cache
+
+    cache_max_size : int, optional
+        Size in bytes over which least recently used sidecars are evicted
+        Default: 10737418240 (10GB)
+
+    sparse : bool, optional
+        Store the numeric channel_lvl{N}_* and productparam_*_{idx} columns
+        mostly holding empty levels as pd.SparseDtype, the fill value is
+        the most frequent placeholder ( 0 or NaN ) of each column,
+        categorical columns are kept
+        eaload.datamining helpers work on the sparse columns
+        Default: False
+
     **kwargs:
         Keyword arguments for pd.read_csv function
 
@@ -43,7 +88,6 @@ def csv_files_2_df(
     pd.Dataframe
         Pandas dataframe object
     """
-    l_df = []
 
     if isinstance(path2files, str):
         path2files = [ path2files ]
@@ -51,48 +95,655 @@ def csv_files_2_df(
     if not isinstance(path2files, list):
         raise TypeError("path2files should be either a str or a list type")
 
+    if not isinstance(n_jobs, int) or n_jobs == 0 or n_jobs < -1:
+        raise TypeError("n_jobs should be a positive integer or -1")
+
+    if n_jobs == -1:
+        n_jobs = _os.cpu_count() or 1
+
+    read_kwargs = dict(
+        sep=sep,
+        quotechar=quotechar,
+        compression=compression,
+        encoding=encoding,
+        **kwargs,
+    )
+
+    # schemas are loaded, or inferred and stored, before any worker starts
+    l_read_kwargs = [
+        _schema_read_kwargs(path2file, read_kwargs, schema_directory)
+        for path2file in path2files
+    ]
+    l_df = [None] * len(path2files)
+    cache = None
+    if cache_directory is not None:
+        pa = _optional._import_pyarrow()
+        cache = _cache._FileCache(cache_directory, cache_max_size)
+        l_key = [
+            _sidecar_key(path2file, file_read_kwargs)
+            for path2file, file_read_kwargs in zip(path2files, l_read_kwargs)
+        ]
+        for i, key in enumerate(l_key):
+            cached = cache.get(key)
+            if cached:
+                _LOGGER.debug("Fetching data of %s from sidecar file=%s", path2files[i], cached)
+                with pa.memory_map(cached, "r") as source:
+                    l_df[i] = pa.ipc.open_file(source).read_all().to_pandas()
+
+    l_miss = [i for i, df in enumerate(l_df) if df is None]
+    l_item = [(path2files[i], l_read_kwargs[i]) for i in l_miss]
+    if n_jobs == 1:
+        l_miss_df = [_read_csv_item(item) for item in l_item]
+    else:
+        l_miss_df = _pool._process_map(
+            func=_read_csv_item,
+            l_item=l_item,
+            max_workers=n_jobs
+        )
+
+    for i, df in zip(l_miss, l_miss_df):
+        l_df[i] = df
+        if cache is not None:
+            _put_sidecar(cache, l_key[i], df)
+
+    # each file is converted once read, its object columns are freed before the next one,
+    # the categories of the files are then merged with union_categoricals
+    df_concat = _concat_frames(l_df)
+
+    # columns left as object by the concat
+    __set_df_col_dtypes(df_concat)
+
+    if sparse:
+        _to_sparse(df_concat)
+
+    df_concat = _rename_viewchannel_columns(df_concat)
+
+    return df_concat
+
+def iter_csv_files(
+    path2files : list,
+    chunksize=100000,
+    sep=';',
+    quotechar='"',
+    compression='gzip',
+    encoding='utf-8',
+    schema_directory=None,
+    sparse=False,
+    **kwargs
+):
+    """ Load a list of csv files into pandas dataframes of at most chunksize rows
+
+    Each chunk has the dtypes and column names of csv_files_2_df,
+    the categories of a column only grow from one chunk to the next:
+    the categories of a chunk start with the categories of the previous chunks
+    Chunks can be deduplicated one by one with eaload.datamining helpers
+
+    Parameters
+    ----------
+    path2files : list, obligatory
+        The targeted list of path2files
+
+    chunksize : int, optional
+        The maximum number of rows of each chunk
+        Default: 100000
+
+    sep : str, obligatory
+        The csv sep char
+        Default: ';'
+
+    quotechar : str, optional
+        The csv quote char
+        Default: '"'
+
+    compression : str, optional
+        The file compression algorithm
+        Default: 'gzip'
+
+    encoding: str, optional
+        The file encoding
+        Default: 'utf-8'
+
+    schema_directory : str, optional
+        The directory of the schemas of each file family ( eaload.schema )
+        The dtypes are passed to pd.read_csv, categorical columns
+        are parsed as categories of str without intermediate objects
+        Combine with usecols to load a subset of the columns
+        Default: None, dtypes are inferred then converted
+
+    sparse : bool, optional
+        Store the columns mostly holding empty levels as pd.SparseDtype,
+        see csv_files_2_df
+        Default: False
+
+    **kwargs:
+        Keyword arguments for pd.read_csv function
+
+
+    Returns
+    -------
+    generator
+        Pandas dataframe objects
+    """
+    if isinstance(path2files, str):
+        path2files = [ path2files ]
+
+    if not isinstance(path2files, list):
+        raise TypeError("path2files should be either a str or a list type")
+
+    if not isinstance(chunksize, int) or chunksize < 1:
+        raise TypeError("chunksize should be a positive integer")
+
+    read_kwargs = dict(
+        sep=sep,
+        quotechar=quotechar,
+        compression=compression,
+        encoding=encoding,
+        **kwargs,
+    )
+
+    d_categories = {}
     for path2file in path2files:
-        df = _pd.read_csv(
+        with _pd.read_csv(
             path2file,
-            sep=sep,
-            quotechar=quotechar,
-            compression=compression,
-            encoding=encoding,
             index_col=None,
             header=0,
-            **kwargs,
-        )
+            chunksize=chunksize,
+            **_schema_read_kwargs(path2file, read_kwargs, schema_directory),
+        ) as reader:
+            for df in reader:
+                __set_df_col_dtypes(df)
+                _grow_categories(df, d_categories)
+                if sparse:
+                    _to_sparse(df)
+                yield _rename_viewchannel_columns(df)
+
+def csv_slices_2_df(
+    path2files : list,
+    columns=None,
+    date_from=None,
+    date_to=None,
+    date_column=None,
+    chunksize=100000,
+    sep=';',
+    quotechar='"',
+    compression='gzip',
+    encoding='utf-8',
+    schema_directory=None,
+    **kwargs
+):
+    """ Load the columns and dates of interest of datamining slice files
+
+    Files named by Conn.download_datamining (..._from_MM_DD_YYYY_to_MM_DD_YYYY.csv.gz)
+    outside of date_from/date_to are not read, other files are always read
+    Only columns are parsed, rows outside of date_from/date_to are dropped
+    chunk by chunk while parsing, see iter_csv_files
+
+    Parameters
+    ----------
+    path2files : list, obligatory
+        The targeted list of path2files
+
+    columns : list, optional
+        The columns to load
+        Default: None, all the columns
+
+    date_from : str, optional
+        mm/dd/yyyy, first day to load
+        Default: None, no lower bound
+
+    date_to : str, optional
+        mm/dd/yyyy, last day to load
+        Default: None, no upper bound
+
+    date_column : str, optional
+        The column of the rows date, epoch timestamps (UTC) or date strings
+        Default: None, files are filtered but not rows
+
+    chunksize : int, optional
+        The number of rows parsed and filtered at once
+        Default: 100000
+
+    sep : str, obligatory
+        The csv sep char
+        Default: ';'
+
+    quotechar : str, optional
+        The csv quote char
+        Default: '"'
+
+    compression : str, optional
+        The file compression algorithm
+        Default: 'gzip'
+
+    encoding: str, optional
+        The file encoding
+        Default: 'utf-8'
+
+    schema_directory : str, optional
+        The directory of the schemas of each file family ( eaload.schema )
+        Default: None, dtypes are inferred then converted
+
+    **kwargs:
+        Keyword arguments for pd.read_csv function
+
+
+    Returns
+    -------
+    pd.Dataframe
+        Pandas dataframe object
+    """
+    if isinstance(path2files, str):
+        path2files = [ path2files ]
+
+    if not isinstance(path2files, list):
+        raise TypeError("path2files should be either a str or a list type")
+
+    if columns is not None and not isinstance(columns, list):
+        raise TypeError("columns should be a list type")
+
+    if date_column is not None and not isinstance(date_column, str):
+        raise TypeError("date_column should be a str type")
+
+    dt_from = _datetime.datetime.strptime(date_from, "%m/%d/%Y") if date_from else None
+    dt_to = _datetime.datetime.strptime(date_to, "%m/%d/%Y") if date_to else None
+
+    l_path2file = [
+        path2file for path2file in path2files
+        if _slice_overlaps(path2file, dt_from, dt_to)
+    ]
+    _LOGGER.debug("Reading %d of %d files", len(l_path2file), len(path2files))
+
+    filter_rows = date_column is not None and (dt_from or dt_to)
+    if columns is not None:
+        kwargs["usecols"] = list(dict.fromkeys(
+            columns + ([date_column] if filter_rows else [])
+        ))
+
+    l_df = []
+    for df in iter_csv_files(
+        l_path2file,
+        chunksize=chunksize,
+        sep=sep,
+        quotechar=quotechar,
+        compression=compression,
+        encoding=encoding,
+        schema_directory=schema_directory,
+        **kwargs,
+    ):
+        if filter_rows:
+            df = df[_date_mask(df[date_column], dt_from, dt_to)]
         l_df.append(df)
 
-    df_concat = _pd.concat(l_df, axis=0, ignore_index=True)
-    __set_df_col_dtypes(df_concat)
+    if not l_df:
+        return _pd.DataFrame(columns=columns)
 
+    df_concat = _concat_frames(l_df).reset_index(drop=True)
+    if filter_rows and columns is not None and date_column not in columns:
+        df_concat = df_concat.drop(columns=date_column)
+
+    return df_concat
+
+def _slice_overlaps(
+    path2file : str,
+    dt_from,
+    dt_to
+):
+    """ Return False if the slice filename dates are outside of dt_from/dt_to """
+    d_slice = _schema.parse_slice_filename(path2file)
+    if d_slice is None:
+        return True
+
+    slice_from = _datetime.datetime.strptime(d_slice["date_from"], "%m/%d/%Y")
+    slice_to = _datetime.datetime.strptime(d_slice["date_to"], "%m/%d/%Y")
+
+    return (dt_to is None or slice_from <= dt_to) and (dt_from is None or slice_to >= dt_from)
+
+def _date_mask(
+    col : _pd.Series,
+    dt_from,
+    dt_to
+):
+    """ Return the mask of the rows from dt_from to the end of the dt_to day """
+    if _pd.api.types.is_numeric_dtype(col):
+        dates = _pd.to_datetime(col, unit="s")
+    else:
+        dates = _pd.to_datetime(col.astype(object), errors="coerce")
+
+    mask = _pd.Series(True, index=col.index)
+    if dt_from is not None:
+        mask &= dates >= dt_from
+    if dt_to is not None:
+        mask &= dates < dt_to + _datetime.timedelta(days=1)
+
+    return mask
+
+def _grow_categories(
+    df : _pd.DataFrame,
+    d_categories : dict
+):
+    """ Extend the categories of a chunk with the categories of the previous chunks
+
+    Parameters
+    ----------
+    df : pd.DataFrame, obligatory
+        The chunk, modified in place
+
+    d_categories : dict, obligatory
+        { col_name : categories of the previous chunks }, updated in place
+
+    Returns
+    -------
+    pd.Dataframe
+        Pandas dataframe object
+    """
+    for col_name in df.columns:
+        col = df[col_name]
+        # categorical in a previous chunk, not inferred as object in this one
+        if col_name in d_categories and not isinstance(col.dtype, _pd.CategoricalDtype):
+            col = col.astype(object).astype('category')
+
+        if not isinstance(col.dtype, _pd.CategoricalDtype):
+            continue
+
+        categories = col.cat.categories
+        if col_name in d_categories:
+            known = d_categories[col_name]
+            categories = known.append(categories.difference(known, sort=False))
+
+        d_categories[col_name] = categories
+        df[col_name] = col.cat.set_categories(categories)
+
+    return df
+
+def _to_sparse( df : _pd.DataFrame ):
+    """ Convert the numeric columns mostly holding empty levels to pd.SparseDtype
+
+    The fill value of a column is its most frequent placeholder of
+    the column family, see eaload.schema.sparse_placeholders
+    Categorical and text columns keep their dtype, their codes already take
+    a byte or two per row and pd.SparseDtype(object) has no deep memory usage
+    Columns stay dense when the sparse values would not be smaller
+
+    Parameters
+    ----------
+    df : pd.DataFrame, obligatory
+        The dataframe, modified in place
+
+    Returns
+    -------
+    pd.Dataframe
+        Pandas dataframe object
+    """
+    for col_name in df.columns:
+        placeholders = _schema.sparse_placeholders(col_name)
+        col = df[col_name]
+        if placeholders is None or isinstance(col.dtype, _pd.SparseDtype) \
+                or not _pd.api.types.is_numeric_dtype(col):
+            continue
+
+        fill_value = None
+        fill_count = 0
+        for value, count in col.value_counts(dropna=False).items():
+            if count > fill_count and (_pd.isna(value) or value in placeholders):
+                fill_value, fill_count = value, count
+
+        if not fill_count:
+            continue
+
+        # values and int32 positions of the non fill cells
+        sparse_nbytes = (len(col) - fill_count) * (col.dtype.itemsize + 4)
+        if sparse_nbytes >= col.memory_usage(index=False):
+            continue
+
+        df[col_name] = col.astype(_pd.SparseDtype(col.dtype, fill_value))
+
+    return df
+
+def _rename_viewchannel_columns( df : _pd.DataFrame ):
+    """ Name the attribution view columns viewchannel_*
+
+    Parameters
+    ----------
+    df : pd.DataFrame, obligatory
+
+    Returns
+    -------
+    pd.Dataframe
+        Pandas dataframe object
+    """
     # if view-id=0 similuate attrib view col
-    if "viewchannel_lvl_p0" not in df_concat.columns:
-        for col_name in df_concat:
+    if "viewchannel_lvl_p0" not in df.columns:
+        for col_name in df:
             if col_name.startswith("channel_lvl0_"):
                 newcol_name = _re.sub(
                     pattern=r"^channel_lvl0_(.+)$",
                     repl=r"viewchannel_\g<1>",
                     string=col_name
                 )
-                df_concat[newcol_name] = df_concat[col_name]
+                df[newcol_name] = df[col_name]
 
     # rename to match new convention
     else:
         d_col_rename_map = {}
-        for col_name in df_concat:
+        for col_name in df:
             new_colname = _re.sub(
                 pattern=r"^(viewchannel)_lvl_(.+)$",
                 repl=r"\g<1>_\g<2>",
                 string=col_name
             )
             d_col_rename_map[col_name] = new_colname
-        df_concat = df_concat.rename(
+        df = df.rename(
             columns=d_col_rename_map
         )
 
-    return df_concat
+    return df
+
+def _read_csv_file(
+    path2file : str,
+    read_kwargs : dict
+):
+    """ Load a csv file into a pandas dataframe with dtype updated
+
+    Parameters
+    ----------
+    path2file : str, obligatory
+        The targeted path2file
+
+    read_kwargs : dict, obligatory
+        Keyword arguments for pd.read_csv function
+
+    Returns
+    -------
+    pd.Dataframe
+        Pandas dataframe object
+    """
+    df = _pd.read_csv(
+        path2file,
+        index_col=None,
+        header=0,
+        **read_kwargs,
+    )
+    __set_df_col_dtypes(df)
+
+    return df
+
+def _read_csv_item( item : tuple ):
+    """ Load a ( path2file, read_kwargs ) item, see _read_csv_file """
+    path2file, read_kwargs = item
+    return _read_csv_file(path2file, read_kwargs)
+
+def _sidecar_key(
+    path2file : str,
+    read_kwargs : dict
+):
+    """ Return the sidecar cache key of a file, changed by any write to the file """
+    stat = _os.stat(path2file)
+    return _hashlib.sha256(_json.dumps(
+        [_os.path.abspath(path2file), stat.st_mtime_ns, stat.st_size, read_kwargs],
+        sort_keys=True,
+        default=str,
+    ).encode()).hexdigest()
+
+def _put_sidecar(
+    cache : _cache._FileCache,
+    key : str,
+    df : _pd.DataFrame
+):
+    """ Store a dataframe in the sidecar cache as a Feather file """
+    tmp_path2file = _os.path.join(cache._directory, key + ".tmp")
+    try:
+        # uncompressed, so that reads memory-map the columns
+        df.to_feather(tmp_path2file, compression="uncompressed")
+    # mixed types object columns cannot be stored
+    except (TypeError, ValueError) as e:
+        _LOGGER.warning("Could not store a sidecar file: %s", e)
+        if _os.path.isfile(tmp_path2file):
+            _os.remove(tmp_path2file)
+        return None
+
+    cache.put(key, tmp_path2file, suffix=".feather", move=True)
+
+def csv_cache_stats(
+    cache_directory : str,
+    cache_max_size=10737418240
+):
+    """ Get statistics of the sidecar cache of csv_files_2_df
+
+    Parameters
+    ----------
+    cache_directory : str, obligatory
+        Directory of the cache
+
+    cache_max_size : int, optional
+        Maximum size in bytes of the cache
+        Default: 10737418240 (10GB)
+
+    Returns
+    -------
+    dict
+        { "hits", "misses", "entries", "size", "max_size" }
+    """
+    return _cache._FileCache(cache_directory, cache_max_size).stats()
+
+def _schema_read_kwargs(
+    path2file : str,
+    read_kwargs : dict,
+    schema_directory=None
+):
+    """ Add the dtypes of the file schema to the pd.read_csv keyword arguments
+
+    Parameters
+    ----------
+    path2file : str, obligatory
+        The targeted path2file
+
+    read_kwargs : dict, obligatory
+        Keyword arguments for pd.read_csv function, an explicit dtype dict wins
+
+    schema_directory : str, optional
+        The directory of the schemas, None to keep read_kwargs
+
+    Returns
+    -------
+    dict
+        Keyword arguments for pd.read_csv function
+    """
+    if schema_directory is None or not isinstance(read_kwargs.get("dtype", {}), dict):
+        return read_kwargs
+
+    d_format = {
+        key: read_kwargs[key]
+        for key in ["sep", "quotechar", "compression", "encoding"]
+    }
+    schema = _schema.load_schema(path2file, schema_directory, **d_format)
+    columns = _pd.read_csv(path2file, header=0, nrows=0, **d_format).columns
+
+    d_dtype = _schema._read_dtypes(schema, columns, read_kwargs.get("usecols"))
+    d_dtype.update(read_kwargs.get("dtype") or {})
+
+    return {**read_kwargs, "dtype": d_dtype}
+
+def _concat_frames( l_df : list ):
+    """ Concatenate dataframes, keeping the categorical columns
+
+    pd.concat turns categorical columns with different categories into objects,
+    columns categorical in a dataframe are merged with union_categoricals,
+    with sorted categories as astype('category')
+    In the other dataframes, such a column inferred with another dtype
+    ( numbers, empty column ) is converted to object then category,
+    categories of different dtypes are left to pd.concat as objects
+
+    Columns are merged one at a time and dropped from the dataframes,
+    so that the peak memory stays close to the result size
+
+    Parameters
+    ----------
+    l_df : list, obligatory
+        The dataframes to concatenate, emptied of the merged columns
+
+    Returns
+    -------
+    pd.Dataframe
+        Pandas dataframe object
+    """
+    if len(l_df) == 1:
+        return l_df[0]
+
+    columns = list(dict.fromkeys(col_name for df in l_df for col_name in df.columns))
+    index = _pd.RangeIndex(sum(len(df) for df in l_df))
+
+    d_col = {}
+    for col_name in columns:
+        l_col = [df[col_name] for df in l_df if col_name in df.columns]
+        # missing from a dataframe, left to pd.concat
+        if len(l_col) < len(l_df):
+            continue
+
+        col = None
+        if any(isinstance(col.dtype, _pd.CategoricalDtype) for col in l_col):
+            categories = next(col for col in l_col if isinstance(col.dtype, _pd.CategoricalDtype)).cat.categories
+            try:
+                col = _pd.Series(_union_categoricals(
+                    [_as_category(col, categories[:0]) for col in l_col],
+                    sort_categories=True,
+                    ignore_order=True
+                ), index=index)
+            # categories of different dtypes, left to pd.concat as objects
+            except TypeError:
+                pass
+
+        if col is None:
+            col = _pd.concat(l_col, axis=0, ignore_index=True)
+
+        d_col[col_name] = col
+        del l_col
+        for df in l_df:
+            del df[col_name]
+
+    # every dataframe, even without columns left, holds its rows
+    if any(len(df.columns) for df in l_df):
+        df_other = _pd.concat(l_df, axis=0, ignore_index=True)
+        for col_name in df_other.columns:
+            d_col[col_name] = df_other[col_name]
+
+    return _pd.DataFrame(
+        {col_name: d_col[col_name] for col_name in columns},
+        index=index,
+        copy=False
+    )
+
+def _as_category(
+    col : _pd.Series,
+    empty_categories : _pd.Index
+):
+    """ Convert a column to category through object, empty columns get empty_categories """
+    if isinstance(col.dtype, _pd.CategoricalDtype):
+        return col
+
+    if col.isna().all():
+        return _pd.Categorical.from_codes([-1] * len(col), dtype=_pd.CategoricalDtype(empty_categories))
+
+    return col.astype(object).astype('category')
 
 def __set_df_col_dtypes( df : _pd.DataFrame() ):
     """ Load a list of csv files into a pandas dataframe
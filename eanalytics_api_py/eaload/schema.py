@@ -0,0 +1,219 @@
+""" Known dtypes of datamining csv files, passed to pd.read_csv
+A schema is inferred once per file family ( datamining type or columns ) and stored as JSON for reuse
+"""
+
+import hashlib as _hashlib
+import json as _json
+import os as _os
+import re as _re
+
+import pandas as _pd
+
+# website_datamining_view_id_from_MM_DD_YYYY_to_MM_DD_YYYY.csv.gz, see Conn.download_datamining
+_SLICE_FILENAME_REGEX = _re.compile(
+    r"^(?P<website_name>.+)_(?P<datamining_type>[a-z]+)_view_(?P<view_id>\d+)"
+    r"_from_(?P<date_from>\d{2}_\d{2}_\d{4})_to_(?P<date_to>\d{2}_\d{2}_\d{4})\.csv(\.gz)?$"
+)
+
+# ( pattern, dtype ) of the known column families, first match wins
+_FAMILY_DTYPES = [
+    (_re.compile(r"^(a_channel_sz|a_orderproduct_sz|channel_lvl_position|product_position|orderproduct_quantity)$"),
+     "int16"),
+    (_re.compile(r"^(order_status|ordertype_key|channel_lvl_via|channel_lvl_profile)$"), "category"),
+    (_re.compile(r"^channel_lvl_p\d+$"), "category"),
+    (_re.compile(r"^(orderproduct_ref|orderproduct_name|productgroup_name)(_\d+)?$"), "category"),
+    (_re.compile(r"^productparam_.+$"), "category"),
+]
+
+# ( pattern, placeholders ) of the column families mostly holding empty levels,
+# NaN is always a placeholder, see sparse=True in eaload.generic
+_SPARSE_FAMILIES = [
+    (_re.compile(r"^channel_lvl\d+_.+$"), ["-", 0, "0"]),
+    (_re.compile(r"^productparam_.+_\d+$"), ["-", 0, "0"]),
+]
+
+_DEFAULT_SCHEMA_NAME = "default"
+
+
+def parse_slice_filename( path2file : str ):
+    """ Parse the filename of a datamining slice
+
+    Parameters
+    ----------
+    path2file : str, obligatory
+        The targeted path2file
+
+    Returns
+    -------
+    dict
+        { website_name, datamining_type, view_id, date_from, date_to }, dates as mm/dd/yyyy
+        None if the filename is not a datamining slice
+    """
+    match = _SLICE_FILENAME_REGEX.match(_os.path.basename(path2file))
+    if not match:
+        return None
+
+    d_slice = match.groupdict()
+    d_slice["date_from"] = d_slice["date_from"].replace("_", "/")
+    d_slice["date_to"] = d_slice["date_to"].replace("_", "/")
+
+    return d_slice
+
+def family_dtype( col_name : str ):
+    """ Return the dtype of a known column family, None if unknown """
+    for pattern, dtype in _FAMILY_DTYPES:
+        if pattern.match(col_name):
+            return dtype
+
+    return None
+
+def sparse_placeholders( col_name : str ):
+    """ Return the placeholders of an empty level of a column family, None if unknown """
+    for pattern, placeholders in _SPARSE_FAMILIES:
+        if pattern.match(col_name):
+            return placeholders
+
+    return None
+
+def infer_schema(
+    path2file : str,
+    nrows=10000,
+    max_category_ratio=0.5,
+    sep=';',
+    quotechar='"',
+    compression='gzip',
+    encoding='utf-8',
+):
+    """ Infer the dtypes of a csv file from its first rows
+
+    Known column families get their dtype, other columns inferred as object
+    with few distinct values become category, others are left to pd.read_csv
+
+    Parameters
+    ----------
+    path2file : str, obligatory
+        The targeted path2file
+
+    nrows : int, optional
+        Number of rows to read
+        Default: 10000
+
+    max_category_ratio : float, optional
+        Columns with less than max_category_ratio distinct values per row
+        are categories
+        Default: 0.5
+
+    sep : str, obligatory
+        The csv sep char
+        Default: ';'
+
+    quotechar : str, optional
+        The csv quote char
+        Default: '"'
+
+    compression : str, optional
+        The file compression algorithm
+        Default: 'gzip'
+
+    encoding: str, optional
+        The file encoding
+        Default: 'utf-8'
+
+    Returns
+    -------
+    dict
+        { col_name : dtype }
+    """
+    df = _pd.read_csv(
+        path2file,
+        sep=sep,
+        quotechar=quotechar,
+        compression=compression,
+        encoding=encoding,
+        index_col=None,
+        header=0,
+        nrows=nrows,
+    )
+
+    schema = {}
+    for col_name in df.columns:
+        col = df[col_name]
+        dtype = family_dtype(col_name)
+        # identifiers are cheaper parsed as strings than as categories
+        if dtype is None and not _pd.api.types.is_numeric_dtype(col) \
+                and col.nunique() <= max_category_ratio * len(col):
+            dtype = "category"
+        if dtype is not None:
+            schema[col_name] = dtype
+
+    return schema
+
+def load_schema(
+    path2file : str,
+    schema_directory : str,
+    **kwargs
+):
+    """ Load the schema of the family of a file, inferred and stored if missing
+
+    The family of a datamining slice is its datamining type, read from its filename,
+    other files with the same columns share a default_<hash of the columns> family
+
+    Parameters
+    ----------
+    path2file : str, obligatory
+        The targeted path2file
+
+    schema_directory : str, obligatory
+        The directory of the <family>.json schemas
+
+    **kwargs:
+        Keyword arguments for infer_schema function
+
+    Returns
+    -------
+    dict
+        { col_name : dtype }
+    """
+    if not isinstance(schema_directory, str):
+        raise TypeError("schema_directory should be a str type")
+
+    d_slice = parse_slice_filename(path2file)
+    if d_slice:
+        name = d_slice["datamining_type"]
+    else:
+        d_format = {key: kwargs[key] for key in ["sep", "quotechar", "compression", "encoding"] if key in kwargs}
+        columns = _pd.read_csv(path2file, header=0, nrows=0, **d_format).columns
+        digest = _hashlib.sha1("\n".join(columns).encode("utf-8")).hexdigest()
+        name = f"{_DEFAULT_SCHEMA_NAME}_{digest[:16]}"
+    path2schema = _os.path.join(schema_directory, f"{name}.json")
+
+    if _os.path.isfile(path2schema):
+        with open(path2schema, "r") as f:
+            return _json.load(f)
+
+    schema = infer_schema(path2file, **kwargs)
+    _os.makedirs(schema_directory, exist_ok=True)
+    with open(path2schema, "w") as f:
+        _json.dump(schema, f, indent=2, sort_keys=True)
+
+    return schema
+
+def _read_dtypes(
+    schema : dict,
+    columns : list,
+    usecols=None
+):
+    """ Return the dtype argument of pd.read_csv for the columns of a file
+
+    Columns missing from the schema, such as extra channel levels,
+    fall back on their column family
+    """
+    d_dtype = {}
+    for col_name in columns:
+        if usecols is not None and not callable(usecols) and col_name not in usecols:
+            continue
+        dtype = schema.get(col_name) or family_dtype(col_name)
+        if dtype is not None:
+            d_dtype[col_name] = dtype
+
+    return d_dtype
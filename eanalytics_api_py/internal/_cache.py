@@ -0,0 +1,168 @@
+"""Internal size-capped file cache with LRU eviction"""
+
+import json
+import os
+import shutil
+import threading
+import time
+
+# one lock per cache directory, shared by every _FileCache of the process
+_LOCKS = {}
+_LOCKS_LOCK = threading.Lock()
+
+
+def _directory_lock(directory: str) -> threading.Lock:
+    """ Return the lock of a cache directory """
+    key = os.path.realpath(directory)
+    with _LOCKS_LOCK:
+        return _LOCKS.setdefault(key, threading.Lock())
+
+
+class _FileCache:
+    """Store files under a key in a directory, evict the least recently
+    used files once the cache exceeds max_size bytes.
+
+    Parameters
+    ----------
+    directory: str, obligatory
+        The cache directory, created if it does not exist
+
+    max_size: int, obligatory
+        Maximum size in bytes of the cached files
+    """
+
+    _INDEX = "index.json"
+
+    def __init__(
+            self,
+            directory: str,
+            max_size: int
+    ):
+        if not isinstance(directory, str) or not directory:
+            raise TypeError("directory should be a non-empty str type")
+
+        if not isinstance(max_size, int) or max_size < 0:
+            raise TypeError("max_size should be a positive integer")
+
+        self._directory = directory
+        self._max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+        self._lock = _directory_lock(directory)
+
+    def _index_path(self) -> str:
+        return os.path.join(self._directory, self._INDEX)
+
+    def _load(self) -> dict:
+        try:
+            with open(self._index_path(), "r") as f:
+                return json.load(f)
+        except (IOError, ValueError):
+            return {"entries": {}, "hits": 0, "misses": 0}
+
+    def _dump(self, index: dict) -> None:
+        tmp_path = f"{self._index_path()}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, self._index_path())
+
+    def get(
+            self,
+            key: str
+    ):
+        """ Return the cached file path of key, None on a cache miss """
+        with self._lock:
+            index = self._load()
+            entry = index["entries"].get(key)
+            path2file = os.path.join(self._directory, entry["file"]) if entry else None
+
+            if path2file and os.path.isfile(path2file):
+                entry["atime"] = time.time()
+                index["hits"] += 1
+            else:
+                index["entries"].pop(key, None)
+                index["misses"] += 1
+                path2file = None
+
+            self._dump(index)
+            return path2file
+
+    def put(
+            self,
+            key: str,
+            path2file: str,
+            suffix: str = "",
+            move: bool = False
+    ) -> str:
+        """ Copy path2file in the cache under key
+
+        Parameters
+        ----------
+        key: str, obligatory
+            The cache key
+
+        path2file: str, obligatory
+            The file to be cached
+
+        suffix: str, optional
+            The extensions of the cached file (.parquet.gz...)
+
+        move: bool, optional
+            Set to True to move path2file instead of copying it,
+            path2file should be on the cache file system
+
+        Returns
+        -------
+        str
+            The cached file path
+        """
+        filename = key + suffix
+        cached_path2file = os.path.join(self._directory, filename)
+        if not move:
+            # copied aside then renamed, a concurrent get never reads a partial file
+            tmp_path2file = f"{cached_path2file}.{os.getpid()}.{threading.get_ident()}.tmp"
+            shutil.copyfile(path2file, tmp_path2file)
+            path2file = tmp_path2file
+        os.replace(path2file, cached_path2file)
+
+        with self._lock:
+            index = self._load()
+            index["entries"][key] = {
+                "file": filename,
+                "size": os.path.getsize(cached_path2file),
+                "atime": time.time(),
+            }
+            self._evict(index)
+            self._dump(index)
+
+        return cached_path2file
+
+    def _evict(self, index: dict) -> None:
+        """ Remove the least recently used files above max_size """
+        entries = index["entries"]
+        total = sum(entry["size"] for entry in entries.values())
+        for key in sorted(entries, key=lambda k: entries[k]["atime"]):
+            if total <= self._max_size:
+                break
+            total -= entries[key]["size"]
+            path2file = os.path.join(self._directory, entries.pop(key)["file"])
+            if os.path.isfile(path2file):
+                os.remove(path2file)
+
+    def stats(self) -> dict:
+        """ Return the cache statistics
+
+        Returns
+        -------
+        dict
+            { "hits" : int, "misses" : int, "entries" : int, "size" : int, "max_size" : int }
+        """
+        with self._lock:
+            index = self._load()
+
+        return {
+            "hits": index["hits"],
+            "misses": index["misses"],
+            "entries": len(index["entries"]),
+            "size": sum(entry["size"] for entry in index["entries"].values()),
+            "max_size": self._max_size,
+        }
@@ -0,0 +1,147 @@
+"""Internal columnar DataFrame builder
+
+Rows are appended into one typed buffer per column, the DataFrame
+is built once on top of those buffers
+"""
+
+import array
+
+import numpy as np
+import pandas as pd
+
+from ._edw_reply import _iter_json_reply
+
+# buffer kinds: int64, float64, python objects
+_INT = "q"
+_FLOAT = "d"
+_OBJECT = "O"
+_RANK = {_INT: 0, _FLOAT: 1, _OBJECT: 2}
+
+
+class _ColumnarBuilder:
+    """Append rows into per-column buffers
+
+    Each column starts as an int64 array.array, and is promoted to float64
+    then to a list of python objects when a value does not fit.
+    array.array over-allocates, appends grow the buffers geometrically.
+
+    Parameters
+    ----------
+    columns: list, obligatory
+        The column names
+    """
+
+    def __init__(
+            self,
+            columns: list
+    ):
+        self.columns = list(columns)
+        self._kinds = [_INT] * len(self.columns)
+        self._buffers = [array.array(_INT) for _ in self.columns]
+
+    def __len__(self) -> int:
+        return len(self._buffers[0]) if self._buffers else 0
+
+    def append(
+            self,
+            row: list
+    ) -> None:
+        """ Append a row, as a list of values in the columns order """
+        if len(row) != len(self.columns):
+            raise ValueError(f"row={row} should have {len(self.columns)} values")
+
+        for i, value in enumerate(row):
+            try:
+                self._buffers[i].append(value)
+            except (TypeError, OverflowError):
+                if value is None and self._kinds[i] != _OBJECT:
+                    self._promote(i, _FLOAT)
+                    value = float("nan")
+                elif isinstance(value, float):
+                    self._promote(i, _FLOAT)
+                else:
+                    self._promote(i, _OBJECT)
+                self._buffers[i].append(value)
+
+    def _promote(
+            self,
+            i: int,
+            kind: str
+    ) -> None:
+        """ Promote the buffer of column i to kind, never demote """
+        if _RANK[kind] <= _RANK[self._kinds[i]]:
+            return None
+
+        if kind == _FLOAT:
+            self._buffers[i] = array.array(_FLOAT, self._buffers[i])
+        else:
+            self._buffers[i] = self._buffers[i].tolist()
+        self._kinds[i] = kind
+
+    def extend(
+            self,
+            other: "_ColumnarBuilder"
+    ) -> None:
+        """ Append the rows of another builder with the same columns """
+        if other.columns != self.columns:
+            raise ValueError("builders should have the same columns")
+
+        for i, other_kind in enumerate(other._kinds):
+            self._promote(i, other_kind)
+            if self._kinds[i] == _OBJECT:
+                self._buffers[i].extend(other._buffers[i])
+            else:
+                self._buffers[i].extend(array.array(self._kinds[i], other._buffers[i]))
+
+    def to_df(self) -> pd.DataFrame:
+        """ Build the DataFrame, numeric buffers are used without copy
+
+        The builder should not be appended to afterwards
+        """
+        d_col = {}
+        for i, (kind, buffer) in enumerate(zip(self._kinds, self._buffers)):
+            if kind == _INT:
+                d_col[i] = np.frombuffer(buffer, dtype=np.int64) if len(buffer) else np.empty(0, dtype=np.int64)
+            elif kind == _FLOAT:
+                d_col[i] = np.frombuffer(buffer, dtype=np.float64) if len(buffer) else np.empty(0, dtype=np.float64)
+            else:
+                values = np.empty(len(buffer), dtype=object)
+                values[:] = buffer
+                d_col[i] = values
+
+        df = pd.DataFrame(d_col, copy=False)
+        df.columns = self.columns
+        return df
+
+
+def _json_to_builder(stream) -> list:
+    """ Stream a JSON API response into a _ColumnarBuilder
+
+    Parameters
+    ----------
+    stream: file-like object, obligatory
+        The binary JSON response
+
+    Returns
+    -------
+    list
+        [ builder, fields, { top-level key : value } ]
+    """
+    builder = None
+    fields = []
+    d_meta = {}
+    for kind, value in _iter_json_reply(stream):
+        if kind == "row":
+            if builder is None:
+                raise ValueError("rows should come after the fields description")
+            builder.append(value)
+        elif kind == "fields":
+            fields = value
+            builder = _ColumnarBuilder([field["name"] for field in fields])
+        else:
+            d_meta[value[0]] = value[1]
+
+    if builder is None:
+        builder = _ColumnarBuilder([])
+
+    return [builder, fields, d_meta]
@@ -0,0 +1,83 @@
+"""Internal date window helper"""
+
+import datetime
+
+_DATE_FORMAT = "%m/%d/%Y"
+
+
+def _period_start(
+        day: datetime.date,
+        date_scale: str
+) -> datetime.date:
+    """ Return the first day of the date_scale period holding day """
+    if date_scale == "W":
+        return day - datetime.timedelta(days=day.weekday())
+    if date_scale == "M":
+        return day.replace(day=1)
+    # H and D periods never span several days
+    return day
+
+
+def _split_date_range(
+        date_from: str,
+        date_to: str,
+        date_scale: str,
+        window_days: int
+) -> list:
+    """ Split an inclusive date range into windows aligned on date_scale periods
+
+    Parameters
+    ----------
+    date_from: str, obligatory
+        mm/dd/yyyy
+
+    date_to: str, obligatory
+        mm/dd/yyyy, included
+
+    date_scale: str, obligatory
+        H, D, W or M, a period is never split between two windows
+
+    window_days: int, obligatory
+        Maximum number of days of a window, a window holds at least one period
+
+    Returns
+    -------
+    list
+        [ (date_from, date_to), ... ] in chronological order
+    """
+    if date_scale not in ["H", "D", "W", "M"]:
+        raise ValueError(f"date_scale={date_scale} should be one of H, D, W, M")
+
+    if not isinstance(window_days, int) or window_days < 1:
+        raise TypeError("window_days should be a positive integer")
+
+    first = datetime.datetime.strptime(date_from, _DATE_FORMAT).date()
+    last = datetime.datetime.strptime(date_to, _DATE_FORMAT).date()
+    if first > last:
+        raise ValueError(f"date_from={date_from} should not be after date_to={date_to}")
+
+    # the periods of the range, clipped on both ends
+    l_period = []
+    start = first
+    while start <= last:
+        period_start = _period_start(start, date_scale)
+        if date_scale == "W":
+            end = period_start + datetime.timedelta(days=6)
+        elif date_scale == "M":
+            end = (period_start + datetime.timedelta(days=31)).replace(day=1) - datetime.timedelta(days=1)
+        else:
+            end = start
+        end = min(end, last)
+        l_period.append((start, end))
+        start = end + datetime.timedelta(days=1)
+
+    # group consecutive periods up to window_days
+    l_window = []
+    for start, end in l_period:
+        if l_window and (end - l_window[-1][0]).days < window_days:
+            l_window[-1] = (l_window[-1][0], end)
+        else:
+            l_window.append((start, end))
+
+    return [(start.strftime(_DATE_FORMAT), end.strftime(_DATE_FORMAT)) for start, end in l_window]
+
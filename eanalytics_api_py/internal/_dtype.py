@@ -0,0 +1,114 @@
+"""Internal DataFrame dtype conversion helper"""
+
+import pandas as pd
+
+# kind of the column types found in the fields description
+_FIELD_TYPE_KIND = {
+    "int": "integer",
+    "integer": "integer",
+    "long": "integer",
+    "float": "float",
+    "double": "float",
+    "number": "float",
+    "decimal": "float",
+    "str": "dimension",
+    "string": "dimension",
+    "text": "dimension",
+}
+
+
+def _field_kind(field) -> str:
+    """ Return the kind (integer, float, dimension) described by a field, None if unknown """
+    if not isinstance(field, dict) or not isinstance(field.get("type"), str):
+        return None
+    return _FIELD_TYPE_KIND.get(field["type"].lower())
+
+
+def _convert_dtypes(
+        df: pd.DataFrame,
+        numeric_columns: list,
+        fields: list = None,
+        category_columns: list = None,
+        downcast: bool = False,
+        max_category_ratio: float = 0.5
+) -> pd.DataFrame:
+    """ Convert the kpi columns to int64/float64 and the dimensions to categorical
+
+    Parameters
+    ----------
+    df: pd.DataFrame, obligatory
+        The DataFrame to convert, modified in place
+
+    numeric_columns: list, obligatory
+        The kpi columns, the only ones converted to a numeric dtype
+        A column holding a non numeric value is left as is
+
+    fields: list, optional
+        The fields description of the API response, as [{ "name" : ..., "type" : ... }]
+        A kpi described as float stays float, a column described as dimension
+        is never converted to a numeric dtype
+
+    category_columns: list, optional
+        Columns always converted to category
+
+    downcast: bool, optional
+        Set to True to convert kpis to the smallest integer dtype,
+        and to float32 when it holds every value exactly
+        Default: False
+
+    max_category_ratio: float, optional
+        Other columns with less than max_category_ratio unique values
+        per row are converted to category
+        Default: 0.5
+
+    Returns
+    -------
+    pd.DataFrame
+        The converted DataFrame
+    """
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("df should be a pd.DataFrame")
+
+    d_kind = {}
+    for field in fields or []:
+        if isinstance(field, dict) and "name" in field:
+            d_kind[field["name"]] = _field_kind(field)
+
+    numeric_columns = set(numeric_columns)
+    category_columns = set(category_columns or [])
+    for col_name in df.columns:
+        kind = "dimension" if col_name in category_columns else d_kind.get(col_name)
+        col = df[col_name]
+
+        if col_name in numeric_columns and kind != "dimension":
+            numeric = pd.to_numeric(col, errors="coerce")
+            # every non-null value is numeric
+            if numeric.notna().sum() == col.notna().sum():
+                df[col_name] = _to_numeric(numeric, integer=kind != "float", downcast=downcast)
+                continue
+
+        if col_name in category_columns or \
+                len(col) and col.nunique(dropna=True) <= max_category_ratio * len(col):
+            df[col_name] = col.astype("category")
+
+    return df
+
+
+def _to_numeric(
+        numeric: pd.Series,
+        integer: bool,
+        downcast: bool
+) -> pd.Series:
+    """ Return numeric as int64, or float64 if it holds NaN or decimals, downcast without loss if asked """
+    if integer and numeric.notna().all() and (numeric % 1 == 0).all():
+        if downcast:
+            return pd.to_numeric(numeric, downcast="integer")
+        return numeric.astype("int64")
+
+    numeric = numeric.astype("float64")
+    if downcast:
+        small = numeric.astype("float32")
+        # float32 only when every value round-trips
+        if (small.astype("float64").eq(numeric) | numeric.isna()).all():
+            return small
+    return numeric
@@ -0,0 +1,442 @@
+"""Eulerian Data Warehouse reply decoding helpers"""
+
+import csv
+import gzip
+import io
+import tempfile
+
+import ijson
+
+from ._optional import _import_pyarrow
+
+# ijson prefixes of the columns description and of the rows in a JSON reply
+_JSON_FIELDS_ARRAY_PREFIX = "data.fields"
+_JSON_FIELDS_PREFIX = "data.fields.item"
+_JSON_ROWS_PREFIX = "data.rows.item"
+_SCALAR_EVENTS = ("null", "boolean", "integer", "double", "number", "string")
+
+
+def _field_name(field) -> str:
+    """ Return the column name of a JSON reply field
+
+    Parameters
+    ----------
+    field: dict or str, obligatory
+        A field as { "name" : "pageview.uid", ... } or the column name itself
+    """
+    if isinstance(field, dict):
+        return field["name"]
+    return str(field)
+
+
+def _iter_json_reply(stream):
+    """ Stream the fields and the rows of a JSON reply in a single pass
+
+    Rows read before the columns description, if any, are held until it is read
+
+    Parameters
+    ----------
+    stream: file-like object, obligatory
+        The binary JSON reply
+
+    Returns
+    -------
+    generator
+        ("fields", [field, ...]) once the columns description is read
+        then ("row", [value, ...]) for each row
+        and ("meta", (key, value)) for the top-level scalars
+    """
+    fields = []
+    fields_read = False
+    fields_sent = False
+    l_pending = []
+    builder = None
+    for prefix, event, value in ijson.parse(stream, use_float=True):
+        # building a field or a row, until its closing event
+        if builder is not None:
+            builder.event(event, value)
+            if event in ("start_map", "start_array"):
+                depth += 1
+            elif event in ("end_map", "end_array"):
+                depth -= 1
+            if not depth:
+                if target == _JSON_FIELDS_PREFIX:
+                    fields.append(builder.value)
+                elif fields_sent:
+                    yield "row", builder.value
+                else:
+                    l_pending.append(builder.value)
+                builder = None
+            continue
+
+        # top-level scalars, such as error and status
+        if prefix and "." not in prefix and event in _SCALAR_EVENTS:
+            yield "meta", (prefix, value)
+            continue
+
+        # end of the columns description, rows read before it are released
+        if prefix == _JSON_FIELDS_ARRAY_PREFIX and event == "end_array":
+            fields_read = True
+            if l_pending:
+                fields_sent = True
+                yield "fields", fields
+                for row in l_pending:
+                    yield "row", row
+                l_pending = []
+            continue
+
+        if prefix not in (_JSON_FIELDS_PREFIX, _JSON_ROWS_PREFIX):
+            continue
+
+        # first row, the columns description is complete
+        if prefix == _JSON_ROWS_PREFIX and fields_read and not fields_sent:
+            fields_sent = True
+            yield "fields", fields
+
+        if event in ("start_map", "start_array"):
+            builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+            depth = 1
+            target = prefix
+        elif prefix == _JSON_FIELDS_PREFIX:
+            fields.append(value)
+        elif fields_sent:
+            yield "row", [value]
+        else:
+            l_pending.append([value])
+
+    # reply without any row, or without columns description
+    if not fields_sent:
+        yield "fields", fields
+        for row in l_pending:
+            yield "row", row
+
+
+def _iter_csv_reply(
+        stream,
+        sep: str = ';',
+        encoding: str = 'utf-8'
+):
+    """ Stream the header and the rows of a CSV reply
+
+    Parameters
+    ----------
+    stream: file-like object, obligatory
+        The binary CSV reply
+
+    sep: str, optional
+        The csv sep char
+        Default: ';'
+
+    encoding: str, optional
+        Default: 'utf-8'
+
+    Returns
+    -------
+    generator
+        ("fields", [name, ...]) then ("row", [value, ...]) for each row
+    """
+    text = io.TextIOWrapper(stream, encoding=encoding, newline='')
+    reader = csv.reader(text, delimiter=sep)
+    header = next(reader, [])
+    yield "fields", header
+    for row in reader:
+        yield "row", row
+
+
+def _iter_batches(
+        events,
+        batch_size: int,
+        arrow: bool = False
+):
+    """ Group the rows of a decoded reply in batches
+
+    Parameters
+    ----------
+    events: generator, obligatory
+        The output of _iter_json_reply or _iter_csv_reply
+
+    batch_size: int, obligatory
+        Maximum number of rows of a batch
+
+    arrow: bool, optional
+        Set to True to yield pyarrow.RecordBatch instead of lists of tuples
+
+    Returns
+    -------
+    generator
+        Batches of at most batch_size rows
+    """
+    fields = []
+    batch = []
+    for kind, value in events:
+        if kind == "fields":
+            fields = [_field_name(field) for field in value]
+            continue
+        if kind != "row":
+            continue
+        batch.append(tuple(value))
+        if len(batch) == batch_size:
+            yield _to_batch(batch, fields, arrow)
+            batch = []
+
+    if batch:
+        yield _to_batch(batch, fields, arrow)
+
+
+def _to_batch(
+        rows: list,
+        fields: list,
+        arrow: bool
+):
+    """ Convert a list of tuples into a pyarrow.RecordBatch if requested """
+    if not arrow:
+        return rows
+
+    pa = _import_pyarrow()
+    columns = list(zip(*rows))
+    return pa.RecordBatch.from_arrays(
+        [pa.array(column) for column in columns],
+        names=fields)
+
+
+def _iter_parquet_batches(
+        stream,
+        batch_size: int,
+        arrow: bool = False,
+        spool_size: int = 64 * 1024 * 1024,
+        chunk_size: int = 1024 * 1024
+):
+    """ Stream the record batches of a Parquet reply
+
+    Parquet metadata sits at the end of the file, the reply is spooled
+    in memory up to spool_size bytes, then on a temporary file.
+
+    Parameters
+    ----------
+    stream: file-like object, obligatory
+        The binary Parquet reply
+
+    batch_size: int, obligatory
+        Maximum number of rows of a batch
+
+    arrow: bool, optional
+        Set to True to yield pyarrow.RecordBatch instead of lists of tuples
+
+    spool_size: int, optional
+        Size in bytes over which the reply is spooled on disk
+
+    Returns
+    -------
+    generator
+        Batches of at most batch_size rows
+    """
+    pa = _import_pyarrow()
+    with tempfile.SpooledTemporaryFile(max_size=spool_size) as spool:
+        chunk = stream.read(chunk_size)
+        while chunk:
+            spool.write(chunk)
+            chunk = stream.read(chunk_size)
+        spool.seek(0)
+
+        parquet_file = pa.parquet.ParquetFile(spool)
+        for record_batch in parquet_file.iter_batches(batch_size=batch_size):
+            if arrow:
+                yield record_batch
+            else:
+                columns = [column.to_pylist() for column in record_batch.columns]
+                yield list(zip(*columns))
+
+
+# arrow type of the column types found in the fields description
+_ARROW_TYPE_MAP = {
+    "int": "int64",
+    "integer": "int64",
+    "long": "int64",
+    "bigint": "int64",
+    "float": "float64",
+    "double": "float64",
+    "number": "float64",
+    "decimal": "float64",
+    "bool": "bool_",
+    "boolean": "bool_",
+    "string": "string",
+    "str": "string",
+    "text": "string",
+}
+
+_CONVERT_FORMATS = ["parquet", "arrow"]
+
+
+def _field_arrow_type(field):
+    """ Return the arrow type described by a JSON reply field, None if unknown
+
+    Parameters
+    ----------
+    field: dict or str, obligatory
+        A field as { "name" : "pageview.uid", "type" : "string" }
+    """
+    if not isinstance(field, dict):
+        return None
+
+    field_type = field.get("type")
+    if not isinstance(field_type, str) or field_type.lower() not in _ARROW_TYPE_MAP:
+        return None
+
+    pa = _import_pyarrow()
+    return getattr(pa, _ARROW_TYPE_MAP[field_type.lower()])()
+
+
+def _value_kind(value) -> str:
+    """ Return the kind of a JSON reply value: bool, int, float or string """
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int"
+    if isinstance(value, float):
+        return "float"
+    return "string"
+
+
+def _scan_kinds(
+        events,
+        n_columns: int
+) -> list:
+    """ Return the set of value kinds of each column of a decoded reply
+
+    Parameters
+    ----------
+    events: generator, obligatory
+        The rows events of _iter_json_reply
+
+    n_columns: int, obligatory
+        The number of fields
+    """
+    l_kinds = [set() for _ in range(n_columns)]
+    for kind, value in events:
+        if kind != "row":
+            continue
+        for kinds, column_value in zip(l_kinds, value):
+            if column_value is not None:
+                kinds.add(_value_kind(column_value))
+
+    return l_kinds
+
+
+def _infer_schema(
+        fields: list,
+        l_kinds: list
+):
+    """ Build the arrow schema of a JSON reply
+
+    Types come from the fields description when available,
+    otherwise from the kinds of all the values of the column,
+    an integer column holding a float is stored as float64, never truncated
+
+    Parameters
+    ----------
+    fields: list, obligatory
+        The fields of the reply
+
+    l_kinds: list, obligatory
+        The value kinds of each column, see _scan_kinds
+    """
+    pa = _import_pyarrow()
+    l_field = []
+    for field, kinds in zip(fields, l_kinds):
+        arrow_type = _field_arrow_type(field)
+        if arrow_type is None:
+            if kinds and kinds <= {"int"}:
+                arrow_type = pa.int64()
+            elif kinds and kinds <= {"int", "float"}:
+                arrow_type = pa.float64()
+            elif kinds == {"bool"}:
+                arrow_type = pa.bool_()
+            # null, text or mixed kinds columns
+            else:
+                arrow_type = pa.string()
+        elif pa.types.is_integer(arrow_type) and "float" in kinds:
+            arrow_type = pa.float64()
+        l_field.append(pa.field(_field_name(field), arrow_type))
+
+    return pa.schema(l_field)
+
+
+def _to_arrow_column(
+        column: tuple,
+        arrow_type
+):
+    """ Convert the values of a column to an arrow array of arrow_type
+
+    Values of a string column that are not text are written as text
+    """
+    pa = _import_pyarrow()
+    if pa.types.is_string(arrow_type):
+        column = [value if value is None or isinstance(value, str) else str(value) for value in column]
+
+    return pa.array(column, type=arrow_type)
+
+
+def _json_to_columnar(
+        path_in: str,
+        path_out: str,
+        output_format: str = "parquet",
+        row_group_size: int = 100000
+) -> None:
+    """ Convert a JSON reply file into a Parquet or Arrow IPC file
+
+    The JSON reply is streamed twice with ijson, once for the column types
+    then to write the rows, only one row group is held in memory at a time
+
+    Parameters
+    ----------
+    path_in: str, obligatory
+        The JSON reply file, gzip compressed if it ends with .gz
+
+    path_out: str, obligatory
+        The Parquet or Arrow IPC output file
+
+    output_format: str, optional
+        parquet or arrow
+        Default: parquet
+
+    row_group_size: int, optional
+        Number of rows of each Parquet row group / Arrow record batch
+        Default: 100000
+    """
+    if output_format not in _CONVERT_FORMATS:
+        raise ValueError(f"output_format={output_format} not allowed. Allowed: {', '.join(_CONVERT_FORMATS)}")
+
+    if not isinstance(row_group_size, int) or row_group_size < 1:
+        raise TypeError("row_group_size should be a positive integer")
+
+    pa = _import_pyarrow()
+    open_in = gzip.open if path_in.endswith(".gz") else open
+    # the types of the whole reply, a later row group may hold floats or the first values
+    with open_in(path_in, "rb") as f_in:
+        events = _iter_json_reply(f_in)
+        fields = next(value for kind, value in events if kind == "fields")
+        schema = _infer_schema(fields, _scan_kinds(events, len(fields)))
+
+    with open_in(path_in, "rb") as f_in:
+        batches = _iter_batches(
+            events=_iter_json_reply(f_in),
+            batch_size=row_group_size)
+
+        if output_format == "parquet":
+            writer = pa.parquet.ParquetWriter(path_out, schema)
+        else:
+            writer = pa.ipc.new_file(path_out, schema)
+
+        with writer:
+            batch = next(batches, [])
+            while batch:
+                columns = list(zip(*batch))
+                record_batch = pa.RecordBatch.from_arrays(
+                    [_to_arrow_column(column, schema.field(i).type) for i, column in enumerate(columns)],
+                    schema=schema)
+                if output_format == "parquet":
+                    writer.write_batch(record_batch, row_group_size=row_group_size)
+                else:
+                    writer.write_batch(record_batch)
+                batch = next(batches, [])
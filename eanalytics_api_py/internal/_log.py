@@ -1,37 +1,77 @@
-"""Internal logging module"""
+"""Internal logging module
 
-import inspect
-import time
+Each module logs through its own logging.getLogger(__name__),
+INFO messages are logged once a Conn( print_log=True ) set the level of the package logger,
+ERROR messages always reach a handler, logging.lastResort (stderr) if none is configured
+"""
 
+import logging
+import sys
 
-def _log(
-        log: str,
-        print_log: bool = True
+_PACKAGE_LOGGER_NAME = "eanalytics_api_py"
+_LOG_FORMAT = "%(asctime)s:%(name)s:%(funcName)s: %(message)s"
+
+_package_logger = logging.getLogger(_PACKAGE_LOGGER_NAME)
+_print_handler = None
+
+
+class _PrintHandler(logging.StreamHandler):
+    """ stdout handler of the package logger
+
+    Silent once the application configured its own handlers,
+    the records then reach them by propagation, never printed twice
+    """
+
+    def emit(
+            self,
+            record: logging.LogRecord
+    ) -> None:
+        if not _has_other_handlers():
+            super().emit(record)
+
+
+def _has_other_handlers() -> bool:
+    """ Return True if a handler other than the print handler gets the package records """
+    logger = _package_logger
+    while logger is not None:
+        for handler in logger.handlers:
+            if handler is not _print_handler and not isinstance(handler, logging.NullHandler):
+                return True
+        if not logger.propagate:
+            break
+        logger = logger.parent
+
+    return False
+
+
+def _set_print_log(
+        print_log: bool
 ) -> None:
-    """ A simple logging mechanism
+    """ Set up the stdout handler of the package logger for a Conn( print_log=True )
+
+    The level of the package logger is only set to INFO when no level was set
+
     Parameters
     ----------
-    log: str, obligatory
-        Log message to be displayed
-
-    print_log: bool, optional
-        Whether to print the log message or not
-    Returns
-    -------
-        None, print a log if print_log is True
+    print_log: bool, obligatory
+        True: INFO messages are printed on stdout,
+            or go to the handlers configured by the application
+        False: nothing is changed
     """
-    if not isinstance(log, str):
-        raise TypeError("log should be str dtype")
+    global _print_handler
 
     if not isinstance(print_log, bool):
         raise TypeError("print_log should be a bool dtype")
 
-    if print_log:
-        stack = inspect.stack()
-        frame = stack[1]
-        caller_func = frame.function
-        caller_mod = inspect.getmodule(frame[0])
-        log_msg = f"{time.ctime()}:{caller_mod.__name__}:{caller_func}: {log}"
-        print(log_msg)
+    if not print_log:
+        return None
+
+    if _print_handler is None:
+        _print_handler = _PrintHandler(sys.stdout)
+        _print_handler.setFormatter(logging.Formatter(_LOG_FORMAT))
+        _package_logger.addHandler(_print_handler)
+
+    if _package_logger.level == logging.NOTSET:
+        _package_logger.setLevel(logging.INFO)
 
     return None
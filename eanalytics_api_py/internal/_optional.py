@@ -0,0 +1,20 @@
+"""Optional dependencies helper"""
+
+
+def _import_pyarrow():
+    """ Import pyarrow on demand
+
+    pyarrow is only required by the Arrow/Parquet features
+    and is not part of the install_requires
+
+    Returns
+    -------
+        The pyarrow module, with pyarrow.parquet loaded
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("pyarrow is required for this feature: pip3 install pyarrow") from e
+
+    return pyarrow
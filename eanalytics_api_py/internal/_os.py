@@ -3,8 +3,6 @@
 import os
 from pathlib import Path
 
-from ._log import _log
-
 
 def _remove_file(
         path2file: str,
@@ -0,0 +1,71 @@
+"""Internal bounded thread pool helper"""
+
+import concurrent.futures
+
+
+def _thread_map(
+        func,
+        l_item: list,
+        max_workers: int
+) -> list:
+    """ Apply func on each item through a bounded thread pool
+
+    Parameters
+    ----------
+    func: callable, obligatory
+        Called with one item
+
+    l_item: list, obligatory
+        The items to process
+
+    max_workers: int, obligatory
+        Maximum number of concurrent calls, 1 runs the calls in series
+
+    Returns
+    -------
+    list
+        The results, in the order of l_item
+    """
+    if not isinstance(max_workers, int) or max_workers < 1:
+        raise TypeError("max_workers should be a positive integer")
+
+    l_item = list(l_item)
+    if max_workers == 1 or len(l_item) <= 1:
+        return [func(item) for item in l_item]
+
+    with concurrent.futures.ThreadPoolExecutor(min(max_workers, len(l_item))) as pool:
+        return list(pool.map(func, l_item))
+
+
+def _process_map(
+        func,
+        l_item: list,
+        max_workers: int
+) -> list:
+    """ Apply func on each item through a bounded process pool
+
+    Parameters
+    ----------
+    func: callable, obligatory
+        A module level function called with one item
+
+    l_item: list, obligatory
+        The items to process
+
+    max_workers: int, obligatory
+        Maximum number of processes, 1 runs the calls in series in this process
+
+    Returns
+    -------
+    list
+        The results, in the order of l_item
+    """
+    if not isinstance(max_workers, int) or max_workers < 1:
+        raise TypeError("max_workers should be a positive integer")
+
+    l_item = list(l_item)
+    if max_workers == 1 or len(l_item) <= 1:
+        return [func(item) for item in l_item]
+
+    with concurrent.futures.ProcessPoolExecutor(min(max_workers, len(l_item))) as pool:
+        return list(pool.map(func, l_item))
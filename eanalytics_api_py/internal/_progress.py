@@ -0,0 +1,109 @@
+"""Internal throttled download progress reporter"""
+
+import logging
+import threading
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _unit(value: float) -> str:
+    """ Human readable byte size """
+    iunit = 0
+    units = ['', 'K', 'M', 'G', 'T', 'P']
+    while value / 1024.00 > 1.0 and iunit < len(units) - 1:
+        iunit += 1
+        value /= 1024
+    return "{:.2f}".format(value) + units[iunit]
+
+
+class _Progress:
+    """Report the progress of a download at most every interval_ms
+
+    Parameters
+    ----------
+    total: int, optional
+        Expected number of bytes (Content-Length), None if unknown
+
+    print_log: bool, optional
+        Set to False to hide the progress line
+        Default: True
+
+    callback: callable, optional
+        Called with a dict as { "done", "total", "percent", "rate", "eta" }
+        rate in bytes/s, eta in seconds, percent and eta are None if total is unknown
+
+    interval_ms: int, optional
+        Minimum delay between two reports
+        Default: 500
+    """
+
+    def __init__(
+            self,
+            total: int = None,
+            print_log: bool = True,
+            callback=None,
+            interval_ms: int = 500
+    ):
+        if callback is not None and not callable(callback):
+            raise TypeError("callback should be a callable")
+
+        if not isinstance(interval_ms, int) or interval_ms < 0:
+            raise TypeError("interval_ms should be a positive integer")
+
+        self.total = total
+        self.done = 0
+        self._print_log = print_log
+        self._callback = callback
+        self._enabled = bool(print_log or callback)
+        self._interval = interval_ms / 1000
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+        self._next = self._start + self._interval
+
+    def update(self, size: int) -> None:
+        """ Account size downloaded bytes, report if interval_ms elapsed """
+        if not self._enabled:
+            return
+
+        with self._lock:
+            self.done += size
+            now = time.monotonic()
+            if now < self._next:
+                return
+            self._next = now + self._interval
+            self._report(now)
+
+    def close(self) -> None:
+        """ Final report """
+        if not self._enabled:
+            return
+
+        with self._lock:
+            self._report(time.monotonic())
+
+    def _report(self, now: float) -> None:
+        elapsed = max(now - self._start, 1e-6)
+        rate = self.done / elapsed
+        percent = eta = None
+        if self.total:
+            percent = 100 * self.done / self.total
+            eta = (self.total - self.done) / rate if rate else None
+
+        if self._callback:
+            self._callback({
+                "done": self.done,
+                "total": self.total,
+                "percent": percent,
+                "rate": rate,
+                "eta": eta,
+            })
+
+        if self._print_log:
+            msg = f"Write : {_unit(self.done)}"
+            if self.total:
+                msg += f"/{_unit(self.total)} {percent:.1f}%"
+            msg += f" {_unit(rate)}/s"
+            if eta is not None:
+                msg += f" ETA {eta:.0f}s"
+            _LOGGER.info("%s", msg)
@@ -1,12 +1,13 @@
 """Request helper module"""
 
-from pprint import pprint
+import logging
 import urllib
 import os
 
 import requests
-from eanalytics_api_py.internal import _os
-from ._log import _log
+from eanalytics_api_py.internal import _os, _columnar
+
+_LOGGER = logging.getLogger(__name__)
 
 
 def _to_json(
@@ -66,10 +67,7 @@ def _to_json(
     log_url = url.replace("/ea/v2/", f"/ea/v2/{api_key}/")
 
     params = urllib.parse.urlencode(params, safe='/') if params else ''
-    #_log(
-    #    log=f"url={log_url}?{params}",
-    #    print_log=print_log
-    #)
+    #_LOGGER.debug("url=%s?%s", log_url, params)
 
     if request_type == "get":
         r = request_map["get"](
@@ -95,20 +93,79 @@ def _to_json(
 
     # JSONDecodeError is a subclass of ValueError
     except ValueError as e:
-        print(f"Could not convert'{r.text}' as json")
+        _LOGGER.error("Could not convert'%s' as json", r.text)
         raise e
 
     else:
         # potential errors from Eulerian Technologies API
         if "error" in r_json.keys() and r_json["error"] \
                 or "status" in r_json.keys() and r_json['status'].lower() == "failed":
-            print("JSON response from Eulerian Technologies API")
-            pprint(r_json)
+            _LOGGER.error("JSON response from Eulerian Technologies API\n%s", r_json)
             raise SystemError(f"Error[{r.status_code}] from Eulerian Technologies API")
 
     return r_json
 
 
+def _to_columnar(
+        url: str,
+        headers: dict = None,
+        params: dict = None,
+        print_log: bool = False
+) -> list:
+    """ Make a streamed HTTP get request and load the rows column by column
+
+    The rows are parsed straight into per-column buffers,
+    the JSON response is never fully materialized
+
+    Parameters
+    ----------
+    url: str, obligatory
+        The url to request
+
+    headers: dict, optional
+        The dict to use as the request header
+
+    params: dict, optional
+        The dict to use as the request params
+
+    print_log: bool, optional
+        Default: False
+    Returns
+    -------
+    list
+        [ _columnar._ColumnarBuilder, the fields description ]
+    """
+    if not isinstance(url, str):
+        raise TypeError("url should be a string dtype")
+
+    if headers and not isinstance(headers, dict):
+        raise TypeError("headers should be a dict dtype")
+
+    if params and not isinstance(params, dict):
+        raise TypeError("params should be a dict dtype")
+
+    params = urllib.parse.urlencode(params, safe='/') if params else ''
+
+    with requests.get(url=url, headers=headers, params=params, stream=True) as r:
+        # let urllib3 handle the transport layer encoding
+        r.raw.decode_content = True
+        try:
+            builder, fields, d_meta = _columnar._json_to_builder(r.raw)
+
+        # ijson errors are subclasses of ValueError
+        except ValueError as e:
+            _LOGGER.error("Could not convert the response of url=%s as json", url)
+            raise e
+
+    # potential errors from Eulerian Technologies API
+    if d_meta.get("error") \
+            or isinstance(d_meta.get("status"), str) and d_meta["status"].lower() == "failed":
+        _LOGGER.error("JSON response from Eulerian Technologies API\n%s", d_meta)
+        raise SystemError(f"Error[{r.status_code}] from Eulerian Technologies API")
+
+    return [builder, fields]
+
+
 def _is_skippable(
         output_path2file: str,
         override_file: bool,
@@ -139,18 +196,15 @@ def _is_skippable(
 
     if os.path.isfile(output_path2file):
         if override_file:
-            _log(
-                log=f"Local file={output_path2file} will be overriden with new data",
-                print_log=print_log)
+            if print_log:
+                _LOGGER.info("Local file=%s will be overriden with new data", output_path2file)
             return False
-        _log(
-            log=f"Fetching data from local file={output_path2file}",
-            print_log=print_log)
+        if print_log:
+            _LOGGER.info("Fetching data from local file=%s", output_path2file)
         return True
 
-    _log(
-        log=f"Local file={output_path2file} not found, downloading the data",
-        print_log=print_log)
+    if print_log:
+        _LOGGER.info("Local file=%s not found, downloading the data", output_path2file)
     return False
 
 def debug_urllib_response_2_file(
@@ -179,8 +233,8 @@ def debug_urllib_response_2_file(
         raise TypeError(f"print_log={print_log} should be a bool instance")
 
     path2file = _os._remove_file_extensions(path2file)+".json"
-    _log(f"Writing debug JSON into path2file={path2file}",
-            print_log=print_log)
+    if print_log:
+        _LOGGER.info("Writing debug JSON into path2file=%s", path2file)
 
     with urllib.request.urlopen(req) as f_in:
         with open(path2file, "wb") as f_out:
@@ -17,8 +17,8 @@ setup(
     download_url='https://github.com/EulerianTechnologies/eanalytics-api-py/archive/master.zip',
     install_requires=[
         'requests>=2.23.0',
-        'ijson>=3.0.4',
-        'pandas>=1.0.3',
+        'ijson>=3.1',
+        'pandas>=1.2',
         'ipython>=7.16.1',
         'ipywidgets>=7.5.1',
         'numpy>=1.19.1',
@@ -43,5 +43,5 @@ setup(
     platforms=['any'],
     python_requires='>=3.6',
     url='https://github.com/EulerianTechnologies/eanalytics-api-py',
-    version='0.1.51',
+    version='0.1.52',
 )
@@ -0,0 +1,77 @@
+import os
+import threading
+
+from eanalytics_api_py.conn import _download_edw
+from eanalytics_api_py.internal import _cache
+
+
+def _write(path, size):
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    return str(path)
+
+
+def test_put_get(tmp_path):
+    cache = _cache._FileCache(str(tmp_path / "cache"), max_size=1000)
+    path2file = _write(tmp_path / "reply.json", 10)
+
+    assert cache.get("key") is None
+    cached = cache.put("key", path2file, suffix=".json")
+
+    assert cached == os.path.join(str(tmp_path / "cache"), "key.json")
+    assert cache.get("key") == cached
+    assert os.path.isfile(path2file)
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1, "size": 10, "max_size": 1000}
+
+
+def test_evict_least_recently_used(tmp_path):
+    cache = _cache._FileCache(str(tmp_path / "cache"), max_size=25)
+    for key in ["a", "b"]:
+        cache.put(key, _write(tmp_path / key, 10))
+    # a is now more recently used than b
+    cache.get("a")
+    cache.put("c", _write(tmp_path / "c", 10))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.stats()["size"] == 20
+
+
+def test_concurrent_caches_of_a_directory(tmp_path):
+    directory = str(tmp_path / "cache")
+    n_threads, n_keys = 8, 5
+    errors = []
+
+    def _worker(i):
+        # a new cache per call, as download_edw does
+        cache = _cache._FileCache(directory, max_size=10 ** 6)
+        try:
+            for k in range(n_keys):
+                key = f"key{i}_{k}"
+                cache.get(key)
+                cache.put(key, _write(tmp_path / f"{key}.src", 10), suffix=".json")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=_worker, args=(i,)) for i in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = _cache._FileCache(directory, max_size=10 ** 6).stats()
+    assert not errors
+    assert stats["entries"] == n_threads * n_keys
+    assert stats["misses"] == n_threads * n_keys
+    assert sorted(os.listdir(directory)) == sorted(
+        ["index.json"] + [f"key{i}_{k}.json" for i in range(n_threads) for k in range(n_keys)])
+
+
+def test_normalize_query():
+    query = 'GET {\n  TIMERANGE   { 1 2 }\n  FILTER { name == "a  b" }\n}\n'
+
+    assert _download_edw.normalize(query) == 'GET { TIMERANGE { 1 2 } FILTER { name == "a  b" } }'
+    assert _download_edw.cache_key("gp", _download_edw.normalize(query)) \
+        == _download_edw.cache_key("gp", _download_edw.normalize(" ".join(query.split(" "))))
+    assert _download_edw.cache_key("gp", "q", True) != _download_edw.cache_key("gp", "q", False)
@@ -0,0 +1,83 @@
+import io
+import json
+import math
+
+import numpy as np
+import pytest
+
+from eanalytics_api_py.internal import _columnar
+
+
+def test_builder_promotion():
+    builder = _columnar._ColumnarBuilder(["i", "f", "o", "n"])
+    builder.append([1, 1, 1, None])
+    builder.append([2, 2.5, 2.5, 2])
+    builder.append([3, 3, "x", 3])
+
+    df = builder.to_df()
+
+    assert df["i"].dtype == np.int64
+    assert df["i"].tolist() == [1, 2, 3]
+    assert df["f"].dtype == np.float64
+    assert df["f"].tolist() == [1.0, 2.5, 3.0]
+    assert df["o"].dtype == object
+    assert df["o"].tolist() == [1, 2.5, "x"]
+    assert df["n"].dtype == np.float64
+    assert math.isnan(df["n"][0]) and df["n"].tolist()[1:] == [2.0, 3.0]
+
+
+def test_builder_none_in_object_column():
+    builder = _columnar._ColumnarBuilder(["o"])
+    builder.append(["x"])
+    builder.append([None])
+
+    col = builder.to_df()["o"]
+    assert col[0] == "x" and col.isna().tolist() == [False, True]
+
+
+def test_builder_extend_promotes():
+    builder = _columnar._ColumnarBuilder(["a", "b"])
+    builder.append([1, 1])
+    other = _columnar._ColumnarBuilder(["a", "b"])
+    other.append([2.5, "y"])
+
+    builder.extend(other)
+
+    assert len(builder) == 2
+    df = builder.to_df()
+    assert df["a"].dtype == np.float64
+    assert df["a"].tolist() == [1.0, 2.5]
+    assert df["b"].tolist() == [1, "y"]
+
+
+def test_builder_checks():
+    builder = _columnar._ColumnarBuilder(["a"])
+    with pytest.raises(ValueError):
+        builder.append([1, 2])
+    with pytest.raises(ValueError):
+        builder.extend(_columnar._ColumnarBuilder(["b"]))
+
+
+@pytest.mark.parametrize("fields_first", [True, False])
+def test_json_to_builder_key_order(fields_first):
+    d_data = {"fields": [{"name": "a"}, {"name": "b"}], "rows": [[1, "x"], [2, None]]}
+    if not fields_first:
+        d_data = {"rows": d_data["rows"], "fields": d_data["fields"]}
+    stream = io.BytesIO(json.dumps({"error": False, "data": d_data}).encode())
+
+    builder, fields, d_meta = _columnar._json_to_builder(stream)
+
+    assert fields == d_data["fields"]
+    assert d_meta == {"error": False}
+    df = builder.to_df()
+    assert df["a"].tolist() == [1, 2]
+    assert df["b"][0] == "x" and df["b"].isna().tolist() == [False, True]
+
+
+def test_json_to_builder_without_rows():
+    stream = io.BytesIO(b'{"data": {"fields": [{"name": "a"}], "rows": []}}')
+
+    builder, fields, d_meta = _columnar._json_to_builder(stream)
+
+    assert builder.columns == ["a"]
+    assert len(builder) == 0
@@ -0,0 +1,164 @@
+import gzip
+import re
+import types
+import zlib
+
+import pytest
+import requests
+
+from eanalytics_api_py.conn import _download_edw
+
+_REPLY = {"data": ["uuid", "https://edw/jobs/uuid/reply"]}
+
+
+class _Raw:
+    def __init__(self, reply):
+        self._reply = reply
+
+    def stream(self, chunk_size, decode_content=True):
+        return self._reply._chunks(self._reply.wire, chunk_size)
+
+
+class _Reply:
+    """ A streamed requests reply, failing after fail_after bytes if set """
+
+    def __init__(self, wire, decoded, status_code, headers, fail_after=None):
+        self.wire = wire
+        self.decoded = decoded
+        self.status_code = status_code
+        self.headers = headers
+        self.raw = _Raw(self)
+        self._fail_after = fail_after
+
+    def _chunks(self, data, chunk_size):
+        for pos in range(0, len(data), chunk_size):
+            if self._fail_after is not None and pos >= self._fail_after:
+                raise requests.exceptions.ConnectionError("connection reset")
+            yield data[pos:pos + chunk_size]
+
+    def iter_content(self, chunk_size):
+        return self._chunks(self.decoded, chunk_size)
+
+    def close(self):
+        pass
+
+
+class _Server:
+    """ Serve body, gzip encoded if encoding='gzip', byte ranges of an identity reply """
+
+    def __init__(self, body, encoding="identity", fail_after=None):
+        self.body = body
+        self.encoding = encoding
+        self.wire = gzip.compress(body) if encoding == "gzip" else body
+        self.fail_after = fail_after
+        self.l_range = []
+
+    def get(self, url, headers=None, stream=False):
+        headers = headers or {}
+        fail_after, self.fail_after = self.fail_after, None
+        d_header = {
+            "Content-Type": "text/csv",
+            "Content-Length": str(len(self.wire)),
+            "Accept-Ranges": "bytes",
+        }
+        if self.encoding != "identity":
+            d_header["Content-Encoding"] = self.encoding
+        if "Range" not in headers:
+            return _Reply(self.wire, self.body, 200, d_header, fail_after)
+
+        begin, end = re.match(r"bytes=(\d+)-(\d*)", headers["Range"]).groups()
+        self.l_range.append((int(begin), int(end) if end else None))
+        end = int(end) + 1 if end else len(self.body)
+        part = self.body[int(begin):end]
+        return _Reply(part, part, 206, d_header, fail_after)
+
+
+def _download(monkeypatch, tmp_path, server, **kwargs):
+    monkeypatch.setattr(_download_edw.requests, "get", server.get)
+    conn = types.SimpleNamespace(_print_log=False)
+    return _download_edw.job_download(conn, _REPLY, {}, str(tmp_path), **kwargs)
+
+
+def test_job_download_gzip_decoded(monkeypatch, tmp_path):
+    # the decoded reply is smaller than the gzip Content-Length
+    body = bytes(range(32))
+    server = _Server(body, encoding="gzip")
+    assert len(server.wire) > len(body)
+
+    path, prefix = _download(monkeypatch, tmp_path, server, chunk_size=8)
+
+    assert prefix == "csv"
+    assert open(path, "rb").read() == body
+
+
+def test_job_download_gzip_decoded_larger(monkeypatch, tmp_path):
+    # the decoded reply is larger than the gzip Content-Length
+    body = b"a;b\n" * 64
+    server = _Server(body, encoding="gzip")
+    assert len(server.wire) < len(body)
+
+    path, prefix = _download(monkeypatch, tmp_path, server, chunk_size=8)
+
+    assert open(path, "rb").read() == body
+
+
+def test_job_download_ranges(monkeypatch, tmp_path):
+    body = bytes(range(256)) * 4
+    server = _Server(body)
+
+    path, prefix = _download(monkeypatch, tmp_path, server, chunk_size=64, n_connections=4)
+
+    assert open(path, "rb").read() == body
+    assert sorted(server.l_range) == [(0, 255), (256, 511), (512, 767), (768, 1023)]
+
+
+def test_job_download_resume(monkeypatch, tmp_path):
+    body = bytes(range(64))
+    server = _Server(body, fail_after=16)
+
+    path, prefix = _download(monkeypatch, tmp_path, server, chunk_size=8)
+
+    assert open(path, "rb").read() == body
+    # resumed from the last byte written
+    assert server.l_range == [(16, 63)]
+
+
+def test_job_download_resume_retries(monkeypatch, tmp_path):
+    server = _Server(bytes(range(64)), fail_after=16)
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        _download(monkeypatch, tmp_path, server, chunk_size=8, retries=0)
+
+
+def test_job_download_gzip_passthrough(monkeypatch, tmp_path):
+    body = b"a;b\n" * 64
+    server = _Server(body, encoding="gzip")
+
+    path, prefix = _download(monkeypatch, tmp_path, server, chunk_size=8, passthrough=True)
+
+    assert path.endswith(".csv.gz")
+    # the encoded bytes are stored as they come
+    assert open(path, "rb").read() == server.wire
+    assert gzip.decompress(open(path, "rb").read()) == body
+
+
+def test_job_download_passthrough_identity(monkeypatch, tmp_path):
+    server = _Server(b"a;b\n" * 64)
+
+    path, prefix = _download(monkeypatch, tmp_path, server, chunk_size=8, passthrough=True)
+
+    assert path.endswith(".csv")
+    assert open(path, "rb").read() == server.body
+
+
+def test_gzip_verify(tmp_path):
+    path = tmp_path / "reply.csv.gz"
+    data = gzip.compress(b"a;b\n" * 64) + gzip.compress(b"c;d\n")
+    path.write_bytes(data)
+
+    # concatenated members
+    _download_edw.gzip_verify(str(path), chunk_size=8)
+
+    path.write_bytes(data[:-4])
+    with pytest.raises(zlib.error):
+        _download_edw.gzip_verify(str(path), chunk_size=8)
@@ -0,0 +1,53 @@
+import sys
+import types
+
+import pandas as pd
+import pytest
+
+from eanalytics_api_py.conn import _download_many
+
+
+def _conn(max_workers=4):
+    return types.SimpleNamespace(_max_workers=max_workers)
+
+
+def _download(conn, website_name):
+    if website_name == "exit":
+        sys.exit(2)
+    if website_name == "error":
+        raise ValueError(website_name)
+    return pd.DataFrame({"value": [conn._max_workers]})
+
+
+def test_fan_out_collects_errors():
+    l_key = ["a", "exit", "error", "b"]
+
+    d_result, d_error = _download_many._fan_out(
+        _conn(),
+        method=_download,
+        l_key=l_key,
+        d_kwargs={key: {"website_name": key} for key in l_key})
+
+    assert sorted(d_result) == ["a", "b"]
+    assert isinstance(d_error["exit"], SystemExit)
+    assert isinstance(d_error["error"], ValueError)
+    # each call sends its requests in series
+    assert d_result["a"]["value"].tolist() == [1]
+
+
+def test_concat_websites():
+    df = _download_many._concat_websites({
+        "a": pd.DataFrame({"value": [1, 2]}),
+        "b": pd.DataFrame({"value": [3]}),
+    })
+
+    assert list(df.columns) == ["website_name", "value"]
+    assert df["website_name"].astype(object).tolist() == ["a", "a", "b"]
+    assert isinstance(df["website_name"].dtype, pd.CategoricalDtype)
+
+
+def test_check_website_names():
+    with pytest.raises(ValueError):
+        _download_many._check_website_names(["a", "a"])
+    with pytest.raises(TypeError):
+        _download_many._check_website_names([])
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+from eanalytics_api_py.internal import _dtype
+
+
+def _df():
+    return pd.DataFrame({
+        "name": ["007", "008", "007", "008"],
+        "visits": [100, 120, 3, 4],
+        "revenue": [1.1, 2.5, 3.0, 4.0],
+        "orders": [1, None, 2, 3],
+        "ref": ["007", "17", "18", "19"],
+    })
+
+
+def test_convert_dtypes_default_64_bits():
+    df = _dtype._convert_dtypes(
+        _df(), numeric_columns=["visits", "revenue", "orders"], category_columns=["name"])
+
+    assert df["visits"].dtype == np.int64
+    assert (df["visits"] + df["visits"]).tolist() == [200, 240, 6, 8]
+    assert df["revenue"].dtype == np.float64
+    assert df["revenue"].tolist() == [1.1, 2.5, 3.0, 4.0]
+    assert df["orders"].dtype == np.float64
+    assert isinstance(df["name"].dtype, pd.CategoricalDtype)
+    assert df["name"].astype(object).tolist() == ["007", "008", "007", "008"]
+
+
+def test_convert_dtypes_dimensions_never_numeric():
+    df = _dtype._convert_dtypes(
+        _df(), numeric_columns=["visits", "ref"], fields=[{"name": "ref", "type": "string"}])
+
+    assert df["ref"].astype(object).tolist() == ["007", "17", "18", "19"]
+    # not a kpi
+    assert df["revenue"].dtype == np.float64
+
+
+def test_convert_dtypes_non_numeric_kpi_left_as_is():
+    df = pd.DataFrame({"kpi": ["1", "x", "3"]})
+
+    df = _dtype._convert_dtypes(df, numeric_columns=["kpi"])
+
+    assert df["kpi"].astype(object).tolist() == ["1", "x", "3"]
+
+
+def test_convert_dtypes_float_field():
+    df = pd.DataFrame({"rate": [1, 2, 3]})
+
+    df = _dtype._convert_dtypes(df, numeric_columns=["rate"], fields=[{"name": "rate", "type": "double"}])
+
+    assert df["rate"].dtype == np.float64
+
+
+def test_convert_dtypes_downcast():
+    df = _df()
+    df["half"] = [0.5, 1.5, np.nan, 2.0]
+
+    df = _dtype._convert_dtypes(
+        df, numeric_columns=["visits", "revenue", "half"], downcast=True)
+
+    assert df["visits"].dtype == np.int8
+    # 1.1 has no exact float32 value
+    assert df["revenue"].dtype == np.float64
+    assert df["half"].dtype == np.float32
@@ -0,0 +1,212 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from eanalytics_api_py import eaload
+from eanalytics_api_py.eaload import generic
+
+
+def _write_csv(path, df):
+    df.to_csv(path, sep=";", index=False)
+    return str(path)
+
+
+def test_csv_files_2_df_different_columns(tmp_path):
+    df_a = pd.DataFrame({"order_ref": ["a0", "a1", "a2"], "amount": [1, 2, 3]})
+    df_b = pd.DataFrame({"order_ref": ["b0", "b1"], "amount": [4, 5], "extra": ["x", "y"]})
+    path2files = [
+        _write_csv(tmp_path / "a.csv", df_a),
+        _write_csv(tmp_path / "b.csv", df_b),
+    ]
+
+    df = eaload.generic.csv_files_2_df(path2files, compression=None)
+
+    assert list(df.columns) == ["order_ref", "amount", "extra"]
+    assert df["order_ref"].astype(object).tolist() == ["a0", "a1", "a2", "b0", "b1"]
+    assert df["amount"].tolist() == [1, 2, 3, 4, 5]
+    assert df["extra"].isna().tolist() == [True, True, True, False, False]
+    assert df["extra"].astype(object).iloc[3:].tolist() == ["x", "y"]
+
+
+def test_concat_frames_same_as_concat():
+    l_df = [
+        pd.DataFrame({
+            "c": pd.Categorical(["u", "v"]),
+            "n": [1, 2],
+            "only_a": [1.5, 2.5],
+        }),
+        pd.DataFrame({
+            "c": pd.Categorical(["w", None]),
+            "n": [3, 4],
+        }),
+        pd.DataFrame({
+            "c": [np.nan, np.nan],
+            "n": [5, 6],
+            "only_c": ["p", "q"],
+        }),
+    ]
+    expected = pd.concat([df.copy() for df in l_df], axis=0, ignore_index=True)
+
+    df = generic._concat_frames(l_df)
+
+    assert list(df.columns) == list(expected.columns)
+    assert isinstance(df["c"].dtype, pd.CategoricalDtype)
+    assert list(df["c"].cat.categories) == ["u", "v", "w"]
+    assert df["c"].astype(object).equals(expected["c"].astype(object))
+    for col_name in ["n", "only_a", "only_c"]:
+        pd.testing.assert_series_equal(df[col_name], expected[col_name])
+
+
+def test_concat_frames_mixed_kinds():
+    l_df = [
+        pd.DataFrame({"d": pd.Categorical(["1", "z"])}),
+        pd.DataFrame({"d": [1, 2]}),
+    ]
+
+    df = generic._concat_frames(l_df)
+
+    # categories of str and int cannot be merged, left to pd.concat as objects
+    assert df["d"].tolist() == ["1", "z", 1, 2]
+
+
+def _order_files(tmp_path, n_files=3):
+    """ csv files of orders, returns their paths and their concatenation """
+    l_df = [
+        pd.DataFrame({
+            "order_ref": [f"o{i}_{j}" for j in range(4)],
+            "order_status": ["ok", "ko", "ok", f"s{i}"],
+            "order_amount": [1.5 * j for j in range(4)],
+        })
+        for i in range(n_files)
+    ]
+    path2files = [_write_csv(tmp_path / f"orders{i}.csv", df) for i, df in enumerate(l_df)]
+    return path2files, pd.concat(l_df, ignore_index=True)
+
+
+def test_csv_files_2_df_n_jobs(tmp_path):
+    path2files, expected = _order_files(tmp_path)
+
+    df = generic.csv_files_2_df(path2files, compression=None)
+    df_jobs = generic.csv_files_2_df(path2files, compression=None, n_jobs=2)
+
+    # files in order, whatever the worker reading them
+    pd.testing.assert_frame_equal(df_jobs, df)
+    assert df["order_ref"].astype(object).tolist() == expected["order_ref"].tolist()
+
+
+def test_csv_files_2_df_n_jobs_errors(tmp_path):
+    path2files, _ = _order_files(tmp_path, n_files=1)
+
+    for n_jobs in [0, -2, 1.5]:
+        with pytest.raises(TypeError):
+            generic.csv_files_2_df(path2files, compression=None, n_jobs=n_jobs)
+
+
+def test_iter_csv_files_chunks(tmp_path):
+    path2files, _ = _order_files(tmp_path)
+    expected = generic.csv_files_2_df(path2files, compression=None)
+
+    l_chunk = list(generic.iter_csv_files(path2files, chunksize=3, compression=None))
+
+    assert [len(chunk) for chunk in l_chunk] == [3, 1, 3, 1, 3, 1]
+    # the categories of a chunk start with those of the previous chunks
+    for prev, chunk in zip(l_chunk, l_chunk[1:]):
+        categories = list(chunk["order_status"].cat.categories)
+        assert categories[:len(prev["order_status"].cat.categories)] \
+            == list(prev["order_status"].cat.categories)
+    df = pd.concat(l_chunk, ignore_index=True)
+    assert df["order_status"].astype(object).tolist() == expected["order_status"].astype(object).tolist()
+    pd.testing.assert_series_equal(df["order_amount"], expected["order_amount"])
+
+
+def test_iter_csv_files_errors(tmp_path):
+    path2files, _ = _order_files(tmp_path, n_files=1)
+
+    with pytest.raises(TypeError):
+        next(generic.iter_csv_files(path2files, chunksize=0, compression=None))
+
+
+def test_csv_files_2_df_sidecar(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    path2files, _ = _order_files(tmp_path)
+    cache_directory = str(tmp_path / "sidecars")
+
+    df = generic.csv_files_2_df(path2files, compression=None, cache_directory=cache_directory)
+    l_read = []
+    read_csv_item = generic._read_csv_item
+    monkeypatch.setattr(generic, "_read_csv_item", lambda item: l_read.append(item[0]) or read_csv_item(item))
+    df_cached = generic.csv_files_2_df(path2files, compression=None, cache_directory=cache_directory)
+
+    assert l_read == []
+    pd.testing.assert_frame_equal(df_cached, df)
+    stats = generic.csv_cache_stats(cache_directory)
+    assert stats["entries"] == 3
+
+    # a written file is read again
+    _write_csv(path2files[1], pd.DataFrame({"order_ref": ["new"], "order_status": ["ok"], "order_amount": [9.0]}))
+    df_cached = generic.csv_files_2_df(path2files, compression=None, cache_directory=cache_directory)
+
+    assert l_read == [path2files[1]]
+    assert "new" in df_cached["order_ref"].astype(object).tolist()
+
+
+def test_csv_slices_2_df_pushdown(tmp_path, monkeypatch):
+    day = 86400
+    first = 1704067200  # 01/01/2024 UTC
+    path2files = []
+    for date_from, date_to, days in [("01_01_2024", "01_03_2024", range(0, 3)),
+                                     ("01_04_2024", "01_06_2024", range(3, 6))]:
+        df = pd.DataFrame({
+            "order_ref": [f"o{d}" for d in days],
+            "order_date": [first + d * day + 3600 for d in days],
+            "order_amount": [float(d) for d in days],
+        })
+        path2files.append(_write_csv(
+            tmp_path / f"site_order_view_0_from_{date_from}_to_{date_to}.csv", df))
+    l_read = []
+    read_csv = pd.read_csv
+    monkeypatch.setattr(
+        generic._pd, "read_csv",
+        lambda path2file, **kwargs: l_read.append(path2file) or read_csv(path2file, **kwargs))
+
+    df = generic.csv_slices_2_df(
+        path2files, columns=["order_ref"], date_from="01/02/2024", date_to="01/03/2024",
+        date_column="order_date", compression=None, chunksize=2)
+
+    # the second slice is not read, nor the columns out of columns
+    assert l_read == [path2files[0]]
+    assert list(df.columns) == ["order_ref"]
+    assert df["order_ref"].astype(object).tolist() == ["o1", "o2"]
+
+
+def test_csv_slices_2_df_no_file(tmp_path):
+    path2file = _write_csv(
+        tmp_path / "site_order_view_0_from_01_01_2024_to_01_03_2024.csv", pd.DataFrame({"order_ref": ["o0"]}))
+
+    df = generic.csv_slices_2_df([path2file], columns=["order_ref"], date_from="02/01/2024", compression=None)
+
+    assert df.empty
+    assert list(df.columns) == ["order_ref"]
+
+
+def test_to_sparse_keeps_categories():
+    n_rows = 100
+    df = pd.DataFrame({
+        "channel_lvl3_p0": pd.Categorical(["-"] * (n_rows - 2) + ["a", "b"]),
+        "channel_lvl3_p1": ["-"] * (n_rows - 1) + ["c"],
+        "channel_lvl3_p2": [0] * (n_rows - 1) + [7],
+        "order_amount": [0] * n_rows,
+    })
+    memory_usage = df.memory_usage(deep=True)
+
+    generic._to_sparse(df)
+
+    assert isinstance(df["channel_lvl3_p0"].dtype, pd.CategoricalDtype)
+    assert not isinstance(df["channel_lvl3_p1"].dtype, pd.SparseDtype)
+    assert df["channel_lvl3_p2"].dtype == pd.SparseDtype(np.int64, 0)
+    assert df["channel_lvl3_p2"].sparse.to_dense().tolist() == [0] * (n_rows - 1) + [7]
+    # not a level column
+    assert df["order_amount"].dtype == np.int64
+    sparse_memory_usage = df.memory_usage(deep=True)
+    assert sparse_memory_usage["channel_lvl3_p2"] < memory_usage["channel_lvl3_p2"]
+    assert sparse_memory_usage.sum() < memory_usage.sum()
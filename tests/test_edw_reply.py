@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from eanalytics_api_py.internal import _edw_reply
+
+pa = pytest.importorskip("pyarrow")
+pytest.importorskip("pyarrow.parquet")
+
+
+def _write_reply(path, fields, rows):
+    with open(path, "w") as f:
+        json.dump({"error": False, "data": {"fields": fields, "rows": rows}}, f)
+    return str(path)
+
+
+def _read_columnar(path, output_format):
+    if output_format == "parquet":
+        return pa.parquet.read_table(path)
+    with pa.memory_map(path, "r") as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+@pytest.mark.parametrize("output_format", ["parquet", "arrow"])
+def test_json_to_columnar_types_of_later_row_groups(tmp_path, output_format):
+    path_in = _write_reply(
+        tmp_path / "reply.json",
+        fields=[{"name": "n"}, {"name": "late"}, {"name": "typed", "type": "int"}],
+        rows=[[1, None, 1], [2, None, 2], [3.5, "x", 3.5]],
+    )
+    path_out = str(tmp_path / "reply.out")
+
+    _edw_reply._json_to_columnar(path_in, path_out, output_format=output_format, row_group_size=2)
+    table = _read_columnar(path_out, output_format)
+
+    assert table.column("n").type == pa.float64()
+    assert table.column("n").to_pylist() == [1.0, 2.0, 3.5]
+    assert table.column("late").type == pa.string()
+    assert table.column("late").to_pylist() == [None, None, "x"]
+    # an int field holding a float is widened, never truncated
+    assert table.column("typed").to_pylist() == [1.0, 2.0, 3.5]
+
+
+def test_infer_schema_kinds():
+    schema = _edw_reply._infer_schema(
+        fields=["i", "f", "b", "s", "null", "mixed"],
+        l_kinds=[{"int"}, {"int", "float"}, {"bool"}, {"string"}, set(), {"int", "string"}],
+    )
+
+    assert schema.types == [pa.int64(), pa.float64(), pa.bool_(), pa.string(), pa.string(), pa.string()]
@@ -0,0 +1,86 @@
+import io
+import json
+import types
+
+import pytest
+
+from eanalytics_api_py.conn import _iter_edw
+
+_ROWS = [[i, f"name{i}"] for i in range(5)]
+
+
+class _Reply:
+    def __init__(self, body, content_type, status_code=200):
+        self.raw = io.BytesIO(body)
+        self.headers = {"Content-Type": content_type}
+        self.status_code = status_code
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.raw.close()
+
+
+def _mock_edw(monkeypatch, body, content_type="application/json", status_code=200):
+    """ Serve body as the JOB reply, returns the list of the killed JOB urls """
+    l_kill = []
+    monkeypatch.setattr(
+        _iter_edw, "job_run",
+        lambda conn, query, ip, accept, encoding: (
+            {"data": ["uuid", "https://edw/jobs/uuid/reply"]}, {}, "https://edw/jobs/uuid"))
+    monkeypatch.setattr(_iter_edw, "kill", lambda url, headers: l_kill.append(url))
+    monkeypatch.setattr(
+        _iter_edw.requests, "get",
+        lambda url, headers=None, stream=False: _Reply(body, content_type, status_code))
+    return l_kill
+
+
+def _iter(**kwargs):
+    return _iter_edw.iter_edw(types.SimpleNamespace(_print_log=False), "get {}", **kwargs)
+
+
+def test_iter_edw_json_batches(monkeypatch):
+    body = json.dumps({
+        "error": False,
+        "data": {"fields": [{"name": "id"}, {"name": "name"}], "rows": _ROWS}}).encode()
+    l_kill = _mock_edw(monkeypatch, body)
+
+    l_batch = list(_iter(batch_size=2))
+
+    assert [len(batch) for batch in l_batch] == [2, 2, 1]
+    assert [row for batch in l_batch for row in batch] == [tuple(row) for row in _ROWS]
+    assert l_kill == ["https://edw/jobs/uuid"]
+
+
+def test_iter_edw_csv(monkeypatch):
+    body = "id;name\n" + "".join(f"{i};{name}\n" for i, name in _ROWS)
+    _mock_edw(monkeypatch, body.encode(), content_type="text/csv")
+
+    l_batch = list(_iter(batch_size=10))
+
+    assert l_batch == [[(str(i), name) for i, name in _ROWS]]
+
+
+def test_iter_edw_kill_on_close(monkeypatch):
+    body = json.dumps({
+        "error": False,
+        "data": {"fields": [{"name": "id"}, {"name": "name"}], "rows": _ROWS}}).encode()
+    l_kill = _mock_edw(monkeypatch, body)
+
+    batches = _iter(batch_size=2)
+    next(batches)
+    assert l_kill == []
+    # the consumer stops early, the JOB is still killed
+    batches.close()
+
+    assert l_kill == ["https://edw/jobs/uuid"]
+
+
+def test_iter_edw_kill_on_error(monkeypatch):
+    l_kill = _mock_edw(monkeypatch, b"", status_code=500)
+
+    with pytest.raises(SystemError, match="Error\\[500\\]"):
+        list(_iter())
+
+    assert l_kill == ["https://edw/jobs/uuid"]
@@ -0,0 +1,66 @@
+import logging
+
+import pytest
+
+from eanalytics_api_py.internal import _log
+
+
+@pytest.fixture
+def package_logger(monkeypatch):
+    """ The package logger, back to its state after the test """
+    logger = _log._package_logger
+    handlers = list(logger.handlers)
+    monkeypatch.setattr(_log, "_print_handler", None)
+    monkeypatch.setattr(logger, "level", logging.NOTSET)
+    monkeypatch.setattr(logger, "propagate", True)
+    yield logger
+    logger.handlers[:] = handlers
+    logging.Logger.manager._clear_cache()
+
+
+def test_print_log_false_keeps_print_log_true(package_logger):
+    _log._set_print_log(True)
+    _log._set_print_log(False)
+
+    assert package_logger.isEnabledFor(logging.INFO)
+
+
+def test_print_log_keeps_configured_level(package_logger):
+    package_logger.setLevel(logging.ERROR)
+
+    _log._set_print_log(True)
+
+    assert package_logger.level == logging.ERROR
+
+
+def test_print_handler_without_application_handlers(package_logger, capsys):
+    package_logger.propagate = False
+    _log._set_print_log(True)
+
+    logging.getLogger("eanalytics_api_py.tests").info("message %d", 1)
+
+    assert capsys.readouterr().out.count("message 1") == 1
+
+
+def test_print_handler_silent_with_application_handlers(package_logger, capsys, caplog):
+    _log._set_print_log(True)
+
+    with caplog.at_level(logging.INFO):
+        logging.getLogger("eanalytics_api_py.tests").info("message %d", 2)
+
+    assert "message 2" not in capsys.readouterr().out
+    assert [record.getMessage() for record in caplog.records] == ["message 2"]
+
+
+def test_errors_without_handlers(package_logger, capsys):
+    # no Conn( print_log=True ), nothing configured by the application
+    package_logger.handlers[:] = [handler for handler in package_logger.handlers
+                                  if not isinstance(handler, _log._PrintHandler)]
+    package_logger.propagate = False
+
+    logging.getLogger("eanalytics_api_py.tests").info("message %d", 3)
+    logging.getLogger("eanalytics_api_py.tests").error("error %d", 4)
+
+    captured = capsys.readouterr()
+    assert "message 3" not in captured.out + captured.err
+    assert "error 4" in captured.err
@@ -0,0 +1,81 @@
+import time
+import types
+
+import pytest
+
+from eanalytics_api_py.conn import _download_flat_overview_realtime_report
+from eanalytics_api_py.internal import _columnar, _request
+
+_CHANNELS = ["ADVERTISING", "BRANDING", "AFFILIATION"]
+
+
+def _conn():
+    return types.SimpleNamespace(
+        _api_v2="api", _http_headers={}, _print_log=False, _max_workers=4,
+        get_view_id_name_map=lambda website_name: {"0": "all"},
+        get_website_by_name=lambda website_name: {"website_id": "1"})
+
+
+def _mock_overview(monkeypatch, delay=None):
+    """ Serve a row per requested path, delay(path) seconds late
+
+    Returns the list of the requested paths
+    """
+    l_requested = []
+
+    def to_columnar(url, params, headers=None, print_log=False):
+        l_requested.append(params["path"])
+        columns = params["ea-columns"].split(",")
+        builder = _columnar._ColumnarBuilder(columns)
+        for path in params["path"].split(","):
+            if delay:
+                time.sleep(delay(path))
+            d_value = {"name": path, "media_key": path, "visits": len(path)}
+            builder.append([d_value.get(col_name, "0") for col_name in columns])
+        return [builder, [{"name": "visits", "type": "INT"}]]
+
+    monkeypatch.setattr(_request, "_to_columnar", to_columnar)
+    return l_requested
+
+
+def _download(**kwargs):
+    return _download_flat_overview_realtime_report.download_flat_overview_realtime_report(
+        _conn(), "01/01/2024", "01/04/2024", "site", "insummary", kpi=["visits"], **kwargs)
+
+
+def test_overview_channels_in_order(monkeypatch):
+    # the first channel answers last
+    _mock_overview(monkeypatch, delay=lambda path: 0.05 if "mcMEDIAAD" in path else 0)
+
+    df = _download(channel=_CHANNELS)
+
+    l_path = [
+        "mcMEDIAINCOMING[1].mcMEDIAAD.mcOPE",
+        "mcMEDIAINCOMING[1].mcMEDIABR.mcOPEDATASEARCHENGINE.mcOPEDATASEARCHENGINE",
+        "mcMEDIAINCOMING[1].mcMEDIAAF.mcOPE",
+    ]
+    assert df["p0"].astype(object).tolist() == [l_path[0], "BRANDING", l_path[2]]
+    assert df["visits"].tolist() == [len(path) for path in l_path]
+
+
+def test_overview_group_channels(monkeypatch):
+    l_requested = _mock_overview(monkeypatch)
+    df = _download(channel=_CHANNELS)
+    l_requested.clear()
+
+    df_grouped = _download(channel=_CHANNELS, group_channels=True)
+
+    # advertising and affiliation share their dimensions
+    assert sorted(l_requested) == [
+        "mcMEDIAINCOMING[1].mcMEDIAAD.mcOPE,mcMEDIAINCOMING[1].mcMEDIAAF.mcOPE",
+        "mcMEDIAINCOMING[1].mcMEDIABR.mcOPEDATASEARCHENGINE.mcOPEDATASEARCHENGINE",
+    ]
+    assert sorted(df_grouped.astype(str).values.tolist()) == sorted(df.astype(str).values.tolist())
+
+
+def test_overview_errors():
+    with pytest.raises(TypeError):
+        _download(group_channels="yes")
+
+    with pytest.raises(TypeError):
+        _download(downcast=1)
@@ -0,0 +1,65 @@
+import pytest
+
+from eanalytics_api_py.internal import _progress
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(_progress, "time", clock)
+    return clock
+
+
+def test_progress_throttled(clock):
+    l_report = []
+    progress = _progress._Progress(
+        total=1000, print_log=False, callback=l_report.append, interval_ms=500)
+
+    for _ in range(8):
+        clock.now += 0.125
+        progress.update(50)
+
+    # 1 s elapsed, one report every 500 ms
+    assert [d["done"] for d in l_report] == [200, 400]
+    progress.close()
+    assert l_report[-1]["done"] == 400
+    assert l_report[-1]["percent"] == 40
+    assert l_report[-1]["rate"] == pytest.approx(400)
+    assert l_report[-1]["eta"] == pytest.approx(1.5)
+
+
+def test_progress_unknown_total(clock):
+    l_report = []
+    progress = _progress._Progress(print_log=False, callback=l_report.append, interval_ms=0)
+
+    clock.now += 1
+    progress.update(10)
+
+    assert l_report == [{"done": 10, "total": None, "percent": None, "rate": 10, "eta": None}]
+
+
+def test_progress_disabled(clock):
+    progress = _progress._Progress(total=1000, print_log=False)
+
+    clock.now += 1
+    progress.update(50)
+    progress.close()
+
+    # nothing is accounted without print_log nor callback
+    assert progress.done == 0
+
+
+def test_progress_errors():
+    with pytest.raises(TypeError):
+        _progress._Progress(callback="print")
+
+    with pytest.raises(TypeError):
+        _progress._Progress(interval_ms=-1)
@@ -0,0 +1,262 @@
+import datetime
+import types
+from urllib.parse import urlencode
+
+import pandas as pd
+import pytest
+
+from eanalytics_api_py.conn import _download_realtime_report, _download_flat_realtime_report
+from eanalytics_api_py.internal import _columnar, _date, _request
+
+_DAY = 86400
+_FIRST = int(datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc).timestamp())
+
+
+def _conn():
+    return types.SimpleNamespace(
+        _api_v2="api", _http_headers={}, _print_log=False, _max_workers=4, _realtime_cache={})
+
+
+def _mock_report(monkeypatch, l_row):
+    """ Serve l_row, [ name, date, value ], as the API would for the payload dates
+
+    Returns the list of the requested params
+    """
+    l_params = []
+
+    def to_columnar(url, params, headers=None, print_log=False):
+        l_params.append(params)
+        first = datetime.datetime.strptime(params["date-from"], "%m/%d/%Y")
+        last = datetime.datetime.strptime(params["date-to"], "%m/%d/%Y")
+        first = int(first.replace(tzinfo=datetime.timezone.utc).timestamp())
+        last = int(last.replace(tzinfo=datetime.timezone.utc).timestamp())
+        builder = _columnar._ColumnarBuilder(["name", "date", "value"])
+        for row in l_row:
+            if first <= row[1] < last + _DAY:
+                builder.append(row)
+        return [builder, [{"name": "value", "type": "INT"}]]
+
+    monkeypatch.setattr(_request, "_to_columnar", to_columnar)
+    return l_params
+
+
+def _window_rows(l_row, l_window):
+    """ The rows of each window, the windows in order """
+    l_expected = []
+    for date_from, date_to in l_window:
+        first = _FIRST + (int(date_from[3:5]) - 1) * _DAY
+        last = _FIRST + int(date_to[3:5]) * _DAY
+        l_expected += [row for row in l_row if first <= row[1] < last]
+    return l_expected
+
+
+@pytest.mark.parametrize("name_major", [True, False])
+def test_fetch_windows_in_order(monkeypatch, name_major):
+    # B only appears in the second window
+    l_row = [["A", _FIRST + day * _DAY, day] for day in range(4)] \
+        + [["B", _FIRST + day * _DAY, 10 + day] for day in range(2, 4)]
+    if not name_major:
+        l_row.sort(key=lambda row: row[1])
+    _mock_report(monkeypatch, l_row)
+    payload = {"date-from": "01/01/2024", "date-to": "01/04/2024", "date-scale": "D"}
+
+    df_single = _download_realtime_report._fetch(_conn(), "url", dict(payload))
+    df_windows = _download_realtime_report._fetch(_conn(), "url", dict(payload), window_days=2)
+
+    l_window = _date._split_date_range("01/01/2024", "01/04/2024", "D", 2)
+    assert df_windows["value"].tolist() == [row[2] for row in _window_rows(l_row, l_window)]
+    # the same rows as a single request
+    pd.testing.assert_frame_equal(
+        df_windows.sort_values("value", ignore_index=True),
+        df_single.sort_values("value", ignore_index=True))
+
+
+def test_all_paths_to_df_windows(monkeypatch):
+    l_row = [
+        [name, _FIRST + day * _DAY, 10 * i + day]
+        for i, name in enumerate(["A", "B"])
+        for day in range(4)
+    ]
+    l_params = _mock_report(monkeypatch, l_row)
+    l_window = _date._split_date_range("01/01/2024", "01/04/2024", "D", 2)
+
+    df = _download_flat_realtime_report._all_paths_to_df(
+        _conn(), url="url", date_scale="D", l_path=["p0", "p1"], l_dim=[], l_kpi=["value"],
+        payload={"date-from": "01/01/2024", "date-to": "01/04/2024"}, l_window=l_window,
+        max_url_length=len("url?date-from=01%2F01%2F2024&date-to=01%2F04%2F2024&path=p0%2C") + 20)
+
+    # each batch for each window, the windows of a batch in order
+    assert [(params["path"], params["date-from"]) for params in l_params] == [
+        ("p0", "01/01/2024"), ("p0", "01/03/2024"), ("p1", "01/01/2024"), ("p1", "01/03/2024")]
+    assert df["value"].tolist() == [row[2] for row in _window_rows(l_row, l_window)] * 2
+
+
+def test_get_all_paths_breadth_first(monkeypatch):
+    d_ids = {
+        "ea:1.mcMEDIA": [1, 2],
+        "ea:1.mcMEDIA[1].total.mcMEDIATYPE": [10],
+        "ea:1.mcMEDIA[2].total.mcMEDIATYPE": [20, 21],
+    }
+    l_requested = []
+
+    def to_json(url, request_type, headers=None, params=None, print_log=False):
+        l_requested.append(params["path"])
+        return {"data": {"fields": [{"name": "name"}, {"name": "id"}],
+                         "rows": [[f"name{_id}", _id] for _id in d_ids[params["path"]]]}}
+
+    monkeypatch.setattr(_request, "_to_json", to_json)
+    payload = {"date-from": "01/01/2024", "date-to": "01/04/2024"}
+
+    l_path = _download_flat_realtime_report._get_all_paths(
+        _conn(), i=1, l_path=["ea:1", "mcMEDIA[%d]", "total", "mcMEDIATYPE[%d]"],
+        l_prev_path=["ea:1"], url="url", payload=payload)
+
+    assert l_path == [
+        "ea:1.mcMEDIA[1].total.mcMEDIATYPE[10]",
+        "ea:1.mcMEDIA[2].total.mcMEDIATYPE[20]",
+        "ea:1.mcMEDIA[2].total.mcMEDIATYPE[21]",
+    ]
+    # one request per parent path, level by level
+    assert l_requested[0] == "ea:1.mcMEDIA"
+    assert sorted(l_requested[1:]) == ["ea:1.mcMEDIA[1].total.mcMEDIATYPE", "ea:1.mcMEDIA[2].total.mcMEDIATYPE"]
+    assert "path" not in payload
+
+
+def _flat_conn():
+    """ A Conn for download_flat_realtime_report, returns it and the list of the expanded paths """
+    l_expanded = []
+    conn = _conn()
+    conn._path_cache = {}
+    conn.get_view_id_name_map = lambda website_name: {"0": "all"}
+    conn.get_website_by_name = lambda website_name: {"website_id": "1"}
+    conn._get_all_paths = lambda i, l_path, l_prev_path, url, payload: \
+        l_expanded.append(".".join(l_path)) or [".".join(l_path)]
+    conn._all_paths_to_df = lambda url, l_path, l_dim, l_kpi, payload, date_scale, l_window: \
+        pd.DataFrame({"path": l_path, "kpi": ",".join(l_kpi)})
+    return conn, l_expanded
+
+
+@pytest.mark.parametrize("path_cache_ttl", [0, 60])
+def test_path_cache(monkeypatch, path_cache_ttl):
+    conn, l_expanded = _flat_conn()
+    clock = [1000.0]
+    monkeypatch.setattr(_download_flat_realtime_report.time, "monotonic", lambda: clock[0])
+
+    def download(kpi):
+        return _download_flat_realtime_report.download_flat_realtime_report(
+            conn, "01/01/2024", "01/04/2024", "site", "report",
+            path_dim_map={"ea:%d.mcMEDIA[%d]": []}, kpi=kpi, path_cache_ttl=path_cache_ttl)
+
+    download(["visits"])
+    df = download(["revenue"])
+    clock[0] += 61
+    download(["visits"])
+
+    assert df.to_dict("records") == [{"path": "ea:1.mcMEDIA[%d]", "kpi": "revenue"}]
+    # reused across kpi sets until expired
+    assert len(l_expanded) == (2 if path_cache_ttl else 3)
+
+
+@pytest.mark.parametrize("max_url_length", [60, 120, 10000])
+def test_batch_paths(max_url_length):
+    url = "https://gp.api.eulerian.com/ea/v2/ea/site/report/realtime/report.json"
+    payload = {"date-from": "01/01/2024", "date-to": "01/31/2024", "path": "ignored"}
+    l_path = [f"mcMEDIA[{i}]/mcMEDIATYPE[{i % 3}]" for i in range(20)]
+
+    l_batch = list(_download_flat_realtime_report._batch_paths(url, l_path, payload, max_url_length))
+
+    assert [path for batch in l_batch for path in batch] == l_path
+    params = {k: v for k, v in payload.items() if k != "path"}
+    for batch in l_batch:
+        length = len(url) + 1 + len(urlencode({**params, "path": ",".join(batch)}, safe='/'))
+        # a single path longer than max_url_length is still sent, alone
+        assert length <= max_url_length or len(batch) == 1
+    if max_url_length == 10000:
+        assert len(l_batch) == 1
+
+
+def test_incremental_refresh(monkeypatch):
+    l_row = [["A", _FIRST + hour * 3600, hour] for hour in range(24 * 5)]
+    l_params = _mock_report(monkeypatch, l_row)
+    conn = _conn()
+    payload = {"date-from": "01/01/2024", "date-to": "01/05/2024", "date-scale": "H"}
+
+    df = _download_realtime_report.download_realtime_report(
+        conn, "site", "report", dict(payload), incremental=True)
+    df["value"] = -1
+    # the last hour is updated, a new one appears
+    l_row[-1][2] = 1000
+    l_row.append(["A", _FIRST + 24 * 5 * 3600 - 1, 1001])
+    df = _download_realtime_report.download_realtime_report(
+        conn, "site", "report", dict(payload), incremental=True)
+
+    assert l_params[-1]["date-from"] == "01/04/2024"
+    assert df["value"].tolist() == [row[2] for row in l_row]
+    assert len(conn._realtime_cache) == 1
+
+
+def test_incremental_today(monkeypatch):
+    l_row = [["A", _FIRST + hour * 3600, hour] for hour in range(10)]
+    l_params = _mock_report(monkeypatch, l_row)
+    conn = _conn()
+    payload = {"date-from": "01/01/2024", "date-to": "01/01/2024", "date-scale": "H"}
+
+    _download_realtime_report.download_realtime_report(
+        conn, "today", "report", dict(payload), incremental=True)
+    # the closed hours are reused, the open hour is replaced, a new hour appears
+    l_row[0][2] = -1
+    l_row[-1][2] = 1000
+    l_row.append(["A", _FIRST + 10 * 3600, 1001])
+    df = _download_realtime_report.download_realtime_report(
+        conn, "today", "report", dict(payload), incremental=True)
+
+    assert [params["date-from"] for params in l_params] == ["01/01/2024", "01/01/2024"]
+    assert df["value"].tolist() == list(range(9)) + [1000, 1001]
+    assert len(conn._realtime_cache) == 1
+
+
+def test_refresh_date_from():
+    # the day before the UTC day, whatever the client timezone
+    assert _download_realtime_report._refresh_date_from(_FIRST + 9 * _DAY, "01/01/2024") == "01/09/2024"
+    assert _download_realtime_report._refresh_date_from(_FIRST + _DAY + 3600, "01/01/2024") == "01/01/2024"
+
+
+def test_split_date_range_days():
+    assert _date._split_date_range("01/01/2024", "01/05/2024", "D", 2) == [
+        ("01/01/2024", "01/02/2024"),
+        ("01/03/2024", "01/04/2024"),
+        ("01/05/2024", "01/05/2024"),
+    ]
+
+
+def test_split_date_range_weeks_aligned():
+    # 01/03/2024 is a Wednesday, a week is never split between windows
+    assert _date._split_date_range("01/03/2024", "01/20/2024", "W", 7) == [
+        ("01/03/2024", "01/07/2024"),
+        ("01/08/2024", "01/14/2024"),
+        ("01/15/2024", "01/20/2024"),
+    ]
+
+
+def test_split_date_range_months_aligned():
+    # a month longer than window_days is a window of its own
+    assert _date._split_date_range("01/15/2024", "03/10/2024", "M", 10) == [
+        ("01/15/2024", "01/31/2024"),
+        ("02/01/2024", "02/29/2024"),
+        ("03/01/2024", "03/10/2024"),
+    ]
+
+
+def test_split_date_range_single_window():
+    assert _date._split_date_range("01/01/2024", "01/31/2024", "H", 31) == [
+        ("01/01/2024", "01/31/2024"),
+    ]
+
+
+def test_split_date_range_errors():
+    with pytest.raises(ValueError):
+        _date._split_date_range("01/01/2024", "01/31/2024", "Y", 7)
+    with pytest.raises(ValueError):
+        _date._split_date_range("02/01/2024", "01/31/2024", "D", 7)
+    with pytest.raises(TypeError):
+        _date._split_date_range("01/01/2024", "01/31/2024", "D", 0)
@@ -0,0 +1,111 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from eanalytics_api_py.eaload import datamining, generic, _reshape
+
+_N_ORDERS = 50
+_N_LEVELS = 6
+_N_INFOS = 3
+
+
+def _order_export(seed=0):
+    """ A datamining order export, most orders touching a few channel levels only """
+    rng = np.random.default_rng(seed)
+    n_touched = rng.geometric(0.5, _N_ORDERS)
+    d_col = {
+        "order_ref": [f"order{i}" for i in range(_N_ORDERS)],
+        "order_amount": rng.integers(0, 100, _N_ORDERS) / 4,
+    }
+    for level in range(_N_LEVELS):
+        touched = level < n_touched
+        for info in range(_N_INFOS):
+            values = np.array([f"value{v}" for v in rng.integers(0, 5, _N_ORDERS)], dtype=object)
+            values[~touched] = "-"
+            # the last info holds numeric ids, 0 on the untouched levels
+            if info == _N_INFOS - 1:
+                values = np.where(touched, rng.integers(1, 5, _N_ORDERS), 0)
+            d_col[f"channel_lvl{level}_p{info}"] = values
+
+    return pd.DataFrame(d_col)
+
+
+def _renamed(df):
+    """ The channel columns named as in deduplicate_touchpoints """
+    df = df.copy()
+    df.columns = [re.sub(r'^(channel)_lvl(\d+)_(.+)$', r"\g<1>_\g<3>_\g<2>", col_name)
+                  for col_name in df.columns]
+    return df
+
+
+def _reference(df, stubnames):
+    """ The pd.wide_to_long implementation of deduplicate_touchpoints """
+    df = pd.wide_to_long(df, stubnames=stubnames, i="order_ref", j="channel_position").reset_index()
+    return df[~df["channel_p0_"].isin(datamining._EMPTY_VALUES)]
+
+
+def _dense(df):
+    return pd.DataFrame({
+        col_name: col.sparse.to_dense() if isinstance(col.dtype, pd.SparseDtype) else col
+        for col_name, col in df.items()
+    })
+
+
+def test_wide_to_long_dense():
+    df = _renamed(_order_export())
+    stubnames = [f"channel_p{info}_" for info in range(_N_INFOS)]
+
+    df_long = _reshape._wide_to_long(
+        df, stubnames=stubnames, i="order_ref", j="channel_position",
+        drop_stub="channel_p0_", drop_values=datamining._EMPTY_VALUES)
+
+    pd.testing.assert_frame_equal(df_long, _reference(df, stubnames))
+
+
+def test_wide_to_long_sparse():
+    df = _order_export()
+    df_sparse = generic._to_sparse(df.copy())
+    assert any(isinstance(dtype, pd.SparseDtype) for dtype in df_sparse.dtypes)
+    stubnames = [f"channel_p{info}_" for info in range(_N_INFOS)]
+
+    df_long = datamining.deduplicate_touchpoints(df_sparse)
+
+    expected = _reference(_renamed(df), stubnames)
+    expected.columns = [col_name.rstrip("_") if col_name.startswith("channel_") else col_name
+                        for col_name in expected.columns]
+    pd.testing.assert_frame_equal(_dense(df_long), expected, check_dtype=False)
+
+
+def test_wide_to_long_fallback():
+    # a channel info missing on the last level, levels are not aligned
+    df = _order_export().drop(columns=[f"channel_lvl{_N_LEVELS - 1}_p2"])
+    stubnames = [f"channel_p{info}_" for info in range(_N_INFOS)]
+    assert _reshape._wide_to_long(
+        _renamed(df), stubnames=stubnames, i="order_ref", j="channel_position",
+        drop_stub="channel_p0_", drop_values=datamining._EMPTY_VALUES) is None
+
+    df_long = datamining.deduplicate_touchpoints(df.copy())
+
+    expected = _reference(_renamed(df), stubnames)
+    expected.columns = [col_name.rstrip("_") if col_name.startswith("channel_") else col_name
+                        for col_name in expected.columns]
+    pd.testing.assert_frame_equal(df_long, expected)
+
+
+def test_deduplicate_products():
+    df = pd.DataFrame({
+        "order_ref": ["o0", "o1", "o2"],
+        "orderproduct_ref_0": ["p0", "p1", "-"],
+        "orderproduct_ref_1": ["p2", "0", "-"],
+        "orderproduct_quantity_0": [1, 2, 0],
+        "orderproduct_quantity_1": [3, 0, 0],
+    })
+    stubnames = ["orderproduct_ref", "orderproduct_quantity"]
+    wide = df.rename(columns=lambda col_name: re.sub(r"_(\d+)$", r"\g<1>", col_name)
+                     if col_name.startswith("orderproduct_") else col_name)
+    expected = pd.wide_to_long(wide, stubnames=stubnames, i="order_ref", j="product_position").reset_index()
+    expected = expected[~expected.orderproduct_ref.isin(datamining._EMPTY_VALUES)]
+
+    pd.testing.assert_frame_equal(datamining.deduplicate_products(df), expected)
+
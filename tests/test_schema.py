@@ -0,0 +1,66 @@
+import os
+
+import pandas as pd
+
+from eanalytics_api_py.eaload import generic, schema
+
+
+def _write_csv(path, df):
+    df.to_csv(path, sep=";", index=False)
+    return str(path)
+
+
+def test_family_dtype():
+    assert schema.family_dtype("channel_lvl_p0") == "category"
+    assert schema.family_dtype("a_channel_sz") == "int16"
+    # levels keep the dtype of their values
+    assert schema.family_dtype("channel_lvl3_p0") is None
+    assert schema.family_dtype("viewchannel_lvl_p0") is None
+
+
+def test_parse_slice_filename():
+    d_slice = schema.parse_slice_filename(
+        "/data/site_order_view_0_from_01_01_2024_to_01_07_2024.csv.gz")
+
+    assert d_slice == {
+        "website_name": "site",
+        "datamining_type": "order",
+        "view_id": "0",
+        "date_from": "01/01/2024",
+        "date_to": "01/07/2024",
+    }
+    assert schema.parse_slice_filename("export.csv") is None
+
+
+def test_csv_files_2_df_schema_same_dtypes(tmp_path):
+    df = pd.DataFrame({
+        "order_ref": [f"o{i}" for i in range(6)],
+        "order_status": ["ok", "ok", "ko", "ok", "ko", "ok"],
+        "a_channel_sz": [1, 2, 1, 1, 2, 1],
+        "channel_lvl0_p0": [8, 0, 8, 8, 0, 8],
+        "channel_lvl_p0": ["a", "b", "a", "a", "b", "a"],
+    })
+    path2file = _write_csv(tmp_path / "export.csv", df)
+
+    expected = generic.csv_files_2_df([path2file], compression=None)
+    df = generic.csv_files_2_df(
+        [path2file], compression=None, schema_directory=str(tmp_path / "schemas"))
+
+    pd.testing.assert_frame_equal(df, expected)
+    assert df["channel_lvl0_p0"].tolist() == [8, 0, 8, 8, 0, 8]
+
+
+def test_load_schema_per_family(tmp_path):
+    schema_directory = str(tmp_path / "schemas")
+    path_a = _write_csv(tmp_path / "a.csv", pd.DataFrame({"order_status": ["ok", "ok", "ko"]}))
+    path_b = _write_csv(tmp_path / "b.csv", pd.DataFrame({"order_ref": ["o1", "o2", "o3"]}))
+    path_c = _write_csv(tmp_path / "c.csv", pd.DataFrame({"order_status": ["ko", "ko", "ok"]}))
+
+    schema_a = schema.load_schema(path_a, schema_directory, compression=None)
+    schema_b = schema.load_schema(path_b, schema_directory, compression=None)
+    schema.load_schema(path_c, schema_directory, compression=None)
+
+    assert schema_a == {"order_status": "category"}
+    assert schema_b == {}
+    # a.csv and c.csv share their columns, hence their schema
+    assert len(os.listdir(schema_directory)) == 2